@@ -0,0 +1,167 @@
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Micro-benchmarks for the filter, sort and output stages of the gather threads on synthetic histories. Each stage is
+# timed on a fresh copy of the history, then run again under tracemalloc for its peak memory. Results are saved as
+# JSON so that runs on different commits can be compared with --compare.
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+WORDS = ["the", "reddit", "comment", "post", "python", "bench", "data", "history", "archive", "delete", "search"]
+SUBREDDITS = ["python", "AskReddit", "programming", "pics", "news", "learnpython", "dataisbeautiful"]
+FILTERS = {"Sort": 0,
+           "Time": (0, 0),
+           "Score": (-50, 1000),
+           "Awarded": 0,
+           "Edited": 2,
+           "Subreddit": "",
+           "Removed": 2,
+           "Search Mode": "Text"}
+
+
+def generate_history(kind, count, seed=0):
+    # Same shape as the record stores the gather threads build, including a share of items reddit.info didn't return
+    from record_store import RecordStore
+
+    generator = random.Random(seed)
+    history = RecordStore(kind)
+
+    for index in range(count):
+        known = generator.random() < 0.97
+        text = " ".join(generator.choices(WORDS, k=generator.randint(1, 60)))
+        if kind == "posts":
+            texts = {"title": " ".join(generator.choices(WORDS, k=generator.randint(3, 12))), "selftext": text}
+        else:
+            texts = {"body": text}
+
+        history.append(f"{index:x}", 1_200_000_000 + generator.randint(0, 500_000_000),
+                       generator.choice(SUBREDDITS), f"/r/bench/comments/{index}/", texts,
+                       score=generator.randint(-100, 5000) if known else None,
+                       edited=generator.random() < 0.2 if known else None,
+                       awarded=generator.random() < 0.03 if known else None,
+                       removed=generator.random() < 0.05 if known else None)
+
+    return history
+
+
+def measure(function, argument):
+    gc.collect()
+    started = time.perf_counter()
+    result = function(argument)
+    elapsed = time.perf_counter() - started
+
+    return elapsed, result
+
+
+def measure_peak_memory(function, argument):
+    gc.collect()
+    tracemalloc.start()
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+def make_thread(kind, sort):
+    from reddit_content_manager import ThreadGatherComments, ThreadGatherPosts
+
+    filters = dict(FILTERS, Sort=sort)
+    profile = ["bench_user", "", "", ""]
+    thread = (ThreadGatherPosts if kind == "posts" else ThreadGatherComments)(None, profile, "", filters)
+
+    # Connected like the main window would be, so emitting costs what it does in the app
+    thread.thread_status.connect(lambda status: None)
+    thread.thread_progress.connect(lambda progress: None)
+    (thread.output_post if kind == "posts" else thread.output_comment).connect(lambda content: None)
+
+    return thread
+
+
+def stages(kind):
+    return [("filter", lambda thread: getattr(thread, f"filter_{kind}"), 0),
+            ("sort new", lambda thread: getattr(thread, f"sort_{kind}"), 0),
+            ("sort top", lambda thread: getattr(thread, f"sort_{kind}"), 1),
+            ("output", lambda thread: getattr(thread, f"output_{kind}"), 0)]
+
+
+def run(sizes, kinds, with_memory):
+    results = []
+
+    for kind in kinds:
+        for size in sizes:
+            for stage, get_stage, sort in stages(kind):
+                thread = make_thread(kind, sort)
+                history = generate_history(kind, size)
+
+                elapsed, _ = measure(get_stage(thread), history)
+                result = {"kind": kind,
+                          "stage": stage,
+                          "size": size,
+                          "seconds": round(elapsed, 4),
+                          "items_per_second": round(size / elapsed, 1) if elapsed else None}
+
+                if with_memory:
+                    history = generate_history(kind, size)
+                    result["peak_memory_mb"] = round(measure_peak_memory(get_stage(thread), history) / 1e6, 2)
+
+                print(f"{kind:>8} {stage:>8} {size:>9}: {result['seconds']:>9.4f}s"
+                      + (f" {result['peak_memory_mb']:>9.2f} MB" if with_memory else ""))
+                results.append(result)
+
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path, results):
+    with open(previous_path) as file:
+        previous = {(result["kind"], result["stage"], result["size"]): result for result in json.load(file)["results"]}
+
+    print(f"\nCompared to {previous_path}:")
+    for result in results:
+        old = previous.get((result["kind"], result["stage"], result["size"]))
+        if old and old["seconds"] and result["seconds"]:
+            print(f"{result['kind']:>8} {result['stage']:>8} {result['size']:>9}: "
+                  f"{old['seconds'] / result['seconds']:>7.2f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the filter, sort and output stages on synthetic histories.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--kinds", nargs="+", choices=["posts", "comments"], default=["posts", "comments"])
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", default="bench_stages.json")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    arguments = parser.parse_args()
+
+    from PySide2.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    results = run(arguments.sizes, arguments.kinds, not arguments.no_memory)
+
+    with open(arguments.output, "w") as file:
+        json.dump({"revision": git_revision(), "timestamp": time.time(), "results": results}, file, indent=4)
+
+    if arguments.compare:
+        compare(arguments.compare, results)
+
+
+if __name__ == "__main__":
+    main()
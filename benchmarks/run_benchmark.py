@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# End-to-end benchmark: drives the real gather and delete threads through the main window (rendered off screen)
+# against the local stand-in server, and reports items/sec and the requests each stage made.
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from stand_in_server import Fixtures, RateLimit, StandInServer
+
+
+def write_profile(author):
+    os.makedirs("profiles", exist_ok=True)
+
+    with open(f"profiles/{author}.rpf", "w+") as file:
+        file.writelines([author + "\n",
+                         "bench-password\n",
+                         "bench-client-id\n",
+                         "bench-client-secret-" + "x" * 12 + "\n"])
+
+
+def wait_for_thread(app, window):
+    while window.background_thread.isRunning():
+        app.processEvents()
+        time.sleep(0.005)
+
+    app.processEvents()
+
+
+def select_profile(app, window, author):
+    window.updater()
+    app.processEvents()
+
+    for index in range(window.ui.profile_list.count()):
+        window.ui.profile_list.item(index).setSelected(window.ui.profile_list.item(index).text() == author)
+
+
+def run_stage(app, window, server, name, start, count_items):
+    server.reset_counts()
+    started = time.perf_counter()
+
+    start()
+    wait_for_thread(app, window)
+
+    elapsed = time.perf_counter() - started
+    items = count_items()
+
+    return {"stage": name,
+            "seconds": round(elapsed, 3),
+            "items": items,
+            "items_per_second": round(items / elapsed, 1) if elapsed else None,
+            "requests": dict(sorted(server.request_counts.items())),
+            "status": window.ui.submission_progress_status.text()}
+
+
+def search(app, window, comments):
+    def start():
+        window.ui.comment_radio.setChecked(comments)
+        window.ui.post_radio.setChecked(not comments)
+        window.search_content()
+
+    return start
+
+
+def delete(app, window, author):
+    def start():
+        window.current_profile = author
+        window.ui.content_tree.selectAll()
+        window.delete_content()
+
+    return start
+
+
+def migrate(app, window, source, target):
+    def start():
+        # The first selected profile is migrated to, the second migrated from
+        select_profile(app, window, target)
+
+        for index in range(window.ui.profile_list.count()):
+            if window.ui.profile_list.item(index).text() == source:
+                window.ui.profile_list.item(index).setSelected(True)
+
+        window.migrate_content()
+
+    return start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gather and delete pipelines against local fixtures.")
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every stand-in response")
+    parser.add_argument("--budget", type=int, default=100000, help="Reddit requests allowed per rate-limit period")
+    parser.add_argument("--period", type=int, default=600, help="Length of the rate-limit period in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--pool-size", type=int, default=8, help="Connections kept open to PushShift")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for a PushShift response")
+    parser.add_argument("--skip-delete", action="store_true")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    arguments = parser.parse_args()
+
+    author = "bench_user"
+    target = "bench_target"
+    fixtures = Fixtures(author=author, num_posts=arguments.posts, num_comments=arguments.comments)
+
+    # The migration target already follows a fifth of the source's subreddits, which should be skipped
+    fixtures.subscriptions[target] = dict(sorted(fixtures.subscriptions[author].items())[::5])
+    server = StandInServer(("127.0.0.1", 0), fixtures, latency=arguments.latency,
+                           rate_limit=RateLimit(arguments.budget, arguments.period),
+                           error_rate=arguments.error_rate).start()
+
+    os.environ["PRAW_ALLOW_ENDPOINT_OVERRIDE"] = "1"
+
+    import pushshift
+    pushshift.SEARCH_URL = server.url + "/reddit/search/{kind}/"
+
+    from http_client import configure_shared_client
+    configure_shared_client(pool_size=arguments.pool_size, timeout=arguments.timeout)
+
+    from PySide2.QtWidgets import QApplication
+    from reddit_content_manager import MainWindow
+
+    working_dir = tempfile.mkdtemp(prefix="rcm-bench-")
+    original_dir = os.getcwd()
+    os.chdir(working_dir)
+
+    try:
+        write_profile(author)
+        write_profile(target)
+
+        # PRAW only reads its endpoints from praw.ini, which it also looks for in the working directory
+        with open("praw.ini", "w") as file:
+            file.write(f"[DEFAULT]\noauth_url={server.url}\nreddit_url={server.url}\n")
+
+        app = QApplication.instance() or QApplication(sys.argv)
+        window = MainWindow()
+        select_profile(app, window, author)
+
+        def count_rows():
+            return window.ui.content_tree.model().rowCount()
+
+        results = []
+        for comments in [False, True]:
+            kind = "comments" if comments else "posts"
+
+            # The first search crawls everything, the second only what's newer than the archive's high-water mark
+            for run in ["cold", "warm"]:
+                results.append(run_stage(app, window, server, f"search {kind} ({run})",
+                                         search(app, window, comments), count_rows))
+
+            if not arguments.skip_delete:
+                results.append(run_stage(app, window, server, f"delete {kind}", delete(app, window, author),
+                                         lambda: server.request_counts.get("reddit:delete", 0)))
+
+        results.append(run_stage(app, window, server, "migrate subs", migrate(app, window, author, target),
+                                 lambda: len(fixtures.subscriptions[target])))
+
+        report = {"fixtures": {"posts": arguments.posts, "comments": arguments.comments},
+                  "latency": arguments.latency,
+                  "pool_size": arguments.pool_size,
+                  "results": results}
+
+        print(json.dumps(report, indent=4))
+
+        if arguments.output:
+            with open(os.path.join(original_dir, arguments.output), "w") as file:
+                json.dump(report, file, indent=4)
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(working_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
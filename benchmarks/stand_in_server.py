@@ -0,0 +1,315 @@
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the PushShift search endpoints and the parts of the Reddit API the app uses, serving synthetic
+# fixtures. Point PushShiftCrawler at http://<host>:<port>/reddit/search/{kind}/ and PRAW at the same address through
+# the oauth_url / reddit_url options of a praw.ini in the working directory.
+
+WORDS = ["the", "reddit", "comment", "post", "python", "bench", "data", "history", "archive", "delete", "search",
+         "window", "thread", "score", "removed", "edited", "award", "local", "server", "fixture"]
+SUBREDDITS = ["python", "AskReddit", "programming", "pics", "news", "learnpython", "dataisbeautiful"]
+
+
+def to_base36(number):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        text = digits[remainder] + text
+        if number == 0:
+            return text
+
+
+class Fixtures:
+    def __init__(self, author="bench_user", num_posts=2000, num_comments=10000, years=5, seed=0):
+        generator = random.Random(seed)
+        now = int(time.time())
+        start = now - years * 365 * 24 * 60 * 60
+
+        self.author = author
+        self.lock = threading.Lock()
+        self.posts = {}
+        self.comments = {}
+        self.subscriptions = {author: {}}
+        self.banned_subreddits = set()  # Lower-case names api/subscribe rejects with a 403
+
+        for index in range(num_posts):
+            post_id = to_base36(36 ** 5 + index)
+            subreddit = generator.choice(SUBREDDITS)
+            self.posts[post_id] = {"id": post_id,
+                                   "name": "t3_" + post_id,
+                                   "author": author,
+                                   "title": " ".join(generator.choices(WORDS, k=generator.randint(3, 12))),
+                                   "selftext": " ".join(generator.choices(WORDS, k=generator.randint(0, 80))),
+                                   "subreddit": subreddit,
+                                   "permalink": f"/r/{subreddit}/comments/{post_id}/bench/",
+                                   "created_utc": generator.randint(start, now),
+                                   "score": generator.randint(-20, 5000),
+                                   "edited": False if generator.random() < 0.8 else generator.randint(start, now),
+                                   "distinguished": None if generator.random() < 0.97 else "moderator",
+                                   "is_self": True}
+
+        for index in range(num_comments):
+            comment_id = to_base36(36 ** 6 + index)
+            subreddit = generator.choice(SUBREDDITS)
+            removed = generator.random() < 0.03
+            self.comments[comment_id] = {"id": comment_id,
+                                         "name": "t1_" + comment_id,
+                                         "author": author,
+                                         "body": "[removed]" if removed else
+                                         " ".join(generator.choices(WORDS, k=generator.randint(1, 120))),
+                                         "subreddit": subreddit,
+                                         "permalink": f"/r/{subreddit}/comments/abc/bench/{comment_id}/",
+                                         "link_id": "t3_abc",
+                                         "parent_id": "t3_abc",
+                                         "created_utc": generator.randint(start, now),
+                                         "score": generator.randint(-20, 2000),
+                                         "edited": False if generator.random() < 0.8 else generator.randint(start, now),
+                                         "distinguished": None if generator.random() < 0.97 else "moderator"}
+
+        for index in range(250):
+            name = f"bench_sub_{index}"
+            self.subscriptions[author][name.lower()] = name
+
+
+class RateLimit:
+    # Fixed window, reported the same way Reddit does through the X-Ratelimit-* headers
+    def __init__(self, budget=600, period=600):
+        self.budget = budget
+        self.period = period
+        self.lock = threading.Lock()
+        self.window_start = time.time()
+        self.used = 0
+
+    def spend(self):
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.period:
+                self.window_start = now
+                self.used = 0
+
+            self.used += 1
+
+            return (self.used <= self.budget,
+                    {"X-Ratelimit-Used": str(self.used),
+                     "X-Ratelimit-Remaining": str(max(0, self.budget - self.used)),
+                     "X-Ratelimit-Reset": str(int(self.period - (now - self.window_start)))})
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency=0.0, rate_limit=None, page_limit=100, error_rate=0.0, seed=0):
+        super().__init__(address, StandInHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.error_rate = error_rate  # Share of PushShift and Reddit API requests answered with a 503
+        self.random = random.Random(seed)
+        self.rate_limit = rate_limit if rate_limit is not None else RateLimit()
+        self.page_limit = page_limit
+        self.counter_lock = threading.Lock()
+        self.request_counts = {}
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def count(self, endpoint):
+        with self.counter_lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+    def reset_counts(self):
+        with self.counter_lock:
+            self.request_counts = {}
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+        return self
+
+
+def listing(kind, children):
+    return {"kind": "Listing", "data": {"after": None, "before": None, "dist": len(children),
+                                        "children": [{"kind": kind, "data": child} for child in children]}}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def parameters(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        parameters = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length", 0))
+            parameters.update(urllib.parse.parse_qsl(self.rfile.read(length).decode("utf-8"), keep_blank_values=True))
+
+        return parsed.path.rstrip("/"), parameters
+
+    def account(self):
+        return self.headers.get("Authorization", "").partition("bench-token:")[2] or self.server.fixtures.author
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def handle_request(self):
+        path, parameters = self.parameters()
+        fixtures = self.server.fixtures
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if path != "/api/v1/access_token" and self.server.random.random() < self.server.error_rate:
+            self.server.count("error:503")
+            self.send_json({"message": "Service Unavailable", "error": 503}, status=503)
+            return
+
+        if path.startswith("/reddit/search/"):
+            self.server.count("pushshift:" + path.split("/")[-1])
+            self.send_json({"data": self.search(path.split("/")[-1], parameters)})
+            return
+
+        if path == "/api/v1/access_token":
+            self.server.count("reddit:access_token")
+            # The token names the account, so requests can be told apart when several profiles are logged in
+            token = "bench-token:" + parameters.get("username", fixtures.author)
+            self.send_json({"access_token": token, "token_type": "bearer", "expires_in": 3600, "scope": "*"})
+            return
+
+        allowed, headers = self.server.rate_limit.spend()
+        if not allowed:
+            self.server.count("reddit:429")
+            self.send_json({"message": "Too Many Requests", "error": 429}, status=429, headers=headers)
+            return
+
+        if path == "/api/info":
+            self.server.count("reddit:info")
+            children = []
+            with fixtures.lock:
+                for fullname in parameters.get("id", "").split(","):
+                    store = fixtures.posts if fullname.startswith("t3_") else fixtures.comments
+                    if fullname[3:] in store:
+                        children.append(("t3" if fullname.startswith("t3_") else "t1", dict(store[fullname[3:]])))
+            self.send_json({"kind": "Listing", "data": {"after": None, "before": None, "dist": len(children),
+                                                        "children": [{"kind": kind, "data": child}
+                                                                     for kind, child in children]}},
+                           headers=headers)
+        elif path == "/api/v1/me":
+            self.server.count("reddit:me")
+            self.send_json({"name": fixtures.author, "id": "bench"}, headers=headers)
+        elif path.startswith("/user/") and path.endswith("/comments"):
+            self.server.count("reddit:user_comments")
+            with fixtures.lock:
+                newest = sorted(fixtures.comments.values(), key=lambda comment: comment["created_utc"],
+                                reverse=True)[:100]
+            self.send_json(listing("t1", newest), headers=headers)
+        elif path == "/api/editusertext":
+            self.server.count("reddit:edit")
+            fullname = parameters.get("thing_id", "")
+            store = fixtures.posts if fullname.startswith("t3_") else fixtures.comments
+            text_field = "selftext" if fullname.startswith("t3_") else "body"
+            with fixtures.lock:
+                content = store.get(fullname[3:])
+                if content is not None:
+                    content[text_field] = parameters.get("text", "")
+                    content["edited"] = int(time.time())
+                    content = dict(content)
+            self.send_json({"json": {"errors": [], "data": {
+                "things": [{"kind": fullname[:2], "data": content}] if content else []}}}, headers=headers)
+        elif path == "/api/del":
+            self.server.count("reddit:delete")
+            fullname = parameters.get("id", "")
+            store = fixtures.posts if fullname.startswith("t3_") else fixtures.comments
+            with fixtures.lock:
+                store.pop(fullname[3:], None)
+            self.send_json({}, headers=headers)
+        elif path == "/subreddits/mine/subscriber":
+            self.server.count("reddit:subscriptions")
+            with fixtures.lock:
+                names = sorted(fixtures.subscriptions.get(self.account(), {}).values())
+            after = parameters.get("after", "")[3:]
+            start = names.index(after) + 1 if after in names else 0
+            limit = int(parameters.get("limit", 100))
+            page = names[start:start + limit]
+            payload = listing("t5", [{"display_name": name, "name": "t5_" + name, "id": name} for name in page])
+            payload["data"]["after"] = "t5_" + page[-1] if start + limit < len(names) else None
+            self.send_json(payload, headers=headers)
+        elif path == "/api/subscribe":
+            self.server.count("reddit:subscribe")
+            names = list(filter(None, parameters.get("sr_name", "").split(",")))
+            if any(name.lower() in fixtures.banned_subreddits for name in names):
+                self.send_json({"message": "Forbidden", "error": 403}, status=403, headers=headers)
+                return
+
+            with fixtures.lock:
+                subscriptions = fixtures.subscriptions.setdefault(self.account(), {})
+                for name in names:
+                    subscriptions[name.lower()] = name
+            self.send_json({}, headers=headers)
+        else:
+            self.server.count("unknown:" + path)
+            self.send_json({"message": "Not Found", "error": 404}, status=404)
+
+    def search(self, kind, parameters):
+        fixtures = self.server.fixtures
+        store = fixtures.posts if kind == "submission" else fixtures.comments
+        after = int(parameters.get("after", 0) or 0)
+        before = int(parameters.get("before", 2 ** 40) or 2 ** 40)
+        limit = min(int(parameters.get("limit", 25)), self.server.page_limit)
+
+        if parameters.get("author", "").lower() != fixtures.author.lower():
+            return []
+
+        with fixtures.lock:
+            matches = [dict(content) for content in store.values() if after < content["created_utc"] < before]
+
+        matches.sort(key=lambda content: content["created_utc"], reverse=parameters.get("sort", "desc") == "desc")
+
+        return matches[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic PushShift and Reddit API fixtures locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--budget", type=int, default=600, help="Reddit requests allowed per rate-limit period")
+    parser.add_argument("--period", type=int, default=600, help="Length of the rate-limit period in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    arguments = parser.parse_args()
+
+    server = StandInServer(("127.0.0.1", arguments.port),
+                           Fixtures(num_posts=arguments.posts, num_comments=arguments.comments),
+                           latency=arguments.latency,
+                           rate_limit=RateLimit(arguments.budget, arguments.period),
+                           error_rate=arguments.error_rate)
+
+    print(f"Serving on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
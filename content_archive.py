@@ -0,0 +1,221 @@
+import os
+import sqlite3
+import numpy
+from record_store import RecordStore
+
+POST_COLUMNS = ["id", "title", "selftext", "subreddit", "permalink", "created",
+                "score", "edited", "awarded", "removed"]
+COMMENT_COLUMNS = ["id", "body", "subreddit", "permalink", "created",
+                   "score", "edited", "awarded", "removed"]
+BOOLEAN_COLUMNS = ["edited", "awarded", "removed"]
+TEXT_COLUMNS = {"posts": ["title", "selftext"], "comments": ["body"]}
+MAX_VARIABLES = 500  # IDs bound per query when matching a list of IDs
+SYNC_OVERLAP = 3 * 24 * 60 * 60  # Seconds before the high-water mark crawled again, for content PushShift indexed late
+
+
+class ContentArchive:
+    # Local SQLite copy of every post and comment gathered for a profile. The PushShift high-water mark is kept per
+    # author and kind so that later searches only have to crawl content created after the last completed sync. The
+    # text columns are indexed in an FTS5 table kept in step with every store, so search text is matched with
+    # full-text queries (phrases, prefix* and AND/OR/NOT) instead of scanning every row.
+    def __init__(self, path="archive/content.db"):
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(path)
+        self.create_tables()
+
+    def create_tables(self):
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS posts ("
+                                    "author TEXT NOT NULL, id TEXT NOT NULL, title TEXT, selftext TEXT, "
+                                    "subreddit TEXT, permalink TEXT, created INTEGER, score INTEGER, "
+                                    "edited INTEGER, awarded INTEGER, removed INTEGER, "
+                                    "PRIMARY KEY (author, id))")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS comments ("
+                                    "author TEXT NOT NULL, id TEXT NOT NULL, body TEXT, "
+                                    "subreddit TEXT, permalink TEXT, created INTEGER, score INTEGER, "
+                                    "edited INTEGER, awarded INTEGER, removed INTEGER, "
+                                    "PRIMARY KEY (author, id))")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS sync_state ("
+                                    "author TEXT NOT NULL, kind TEXT NOT NULL, high_water INTEGER NOT NULL, "
+                                    "PRIMARY KEY (author, kind))")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS posts_created ON posts (author, created)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS comments_created ON comments (author, created)")
+
+            for kind, columns in TEXT_COLUMNS.items():
+                self.create_text_index(kind, columns)
+
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS stored_ids (id TEXT PRIMARY KEY)")
+
+    def create_text_index(self, kind, columns):
+        exists = self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f"{kind}_fts",)).fetchone()
+
+        self.connection.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {kind}_fts USING fts5("
+                                f"{', '.join(columns)}, content='{kind}', content_rowid='rowid')")
+        self.connection.execute(f"CREATE TRIGGER IF NOT EXISTS {kind}_fts_delete AFTER DELETE ON {kind} BEGIN "
+                                f"INSERT INTO {kind}_fts ({kind}_fts, rowid, {', '.join(columns)}) "
+                                f"VALUES ('delete', old.rowid, {', '.join(f'old.{column}' for column in columns)}); "
+                                f"END")
+
+        # Archives from before the index existed are indexed in one go
+        if not exists:
+            self.connection.execute(f"INSERT INTO {kind}_fts ({kind}_fts) VALUES ('rebuild')")
+
+    def high_water(self, kind, author):
+        row = self.connection.execute("SELECT high_water FROM sync_state WHERE author = ? AND kind = ?",
+                                      (author.lower(), kind)).fetchone()
+
+        return row[0] if row is not None else 0
+
+    def crawl_after(self, kind, author):
+        # Where the next sync starts crawling. Content PushShift ingested after the last sync can be older than the
+        # high-water mark, so the last few days are crawled again; the upserts make the repeats harmless.
+        high_water = self.high_water(kind, author)
+
+        return max(0, high_water - SYNC_OVERLAP) if high_water else 0
+
+    def set_high_water(self, kind, author, high_water):
+        with self.connection:
+            self.connection.execute("INSERT INTO sync_state (author, kind, high_water) VALUES (?, ?, ?) "
+                                    "ON CONFLICT (author, kind) DO UPDATE SET "
+                                    "high_water = MAX(high_water, excluded.high_water)",
+                                    (author.lower(), kind, int(high_water)))
+
+    def known_ids(self, kind, author):
+        return {row[0] for row in self.connection.execute(f"SELECT id FROM {kind} WHERE author = ?",
+                                                          (author.lower(),))}
+
+    def store(self, author, records, rows=None):
+        kind = records.kind
+        columns = POST_COLUMNS if kind == "posts" else COMMENT_COLUMNS
+
+        values_by_row = []
+        for row in (rows if rows is not None else range(len(records))):
+            values = [author.lower()]
+            for column in columns:
+                value = records.value(column, row)
+
+                if value is not None and column in BOOLEAN_COLUMNS:
+                    value = int(value)
+
+                values.append(value)
+
+            values_by_row.append(values)
+
+        # The text index is updated in bulk around the upsert rather than from per-row triggers, which are several
+        # times slower: the stored rows' old text is taken out of the index first and their new text added after.
+        text_columns = ", ".join(TEXT_COLUMNS[kind])
+        stored = "author = ? AND id IN (SELECT id FROM stored_ids)"
+
+        with self.connection:
+            self.connection.execute("DELETE FROM stored_ids")
+            self.connection.executemany("INSERT OR IGNORE INTO stored_ids (id) VALUES (?)",
+                                        [(values[1],) for values in values_by_row])
+
+            self.connection.execute(f"INSERT INTO {kind}_fts ({kind}_fts, rowid, {text_columns}) "
+                                    f"SELECT 'delete', rowid, {text_columns} FROM {kind} WHERE {stored}",
+                                    (author.lower(),))
+            self.connection.executemany(f"INSERT INTO {kind} (author, {', '.join(columns)}) "
+                                        f"VALUES ({', '.join('?' for _ in range(len(columns) + 1))}) "
+                                        f"ON CONFLICT (author, id) DO UPDATE SET "
+                                        f"{', '.join(f'{column} = excluded.{column}' for column in columns[1:])}",
+                                        values_by_row)
+            self.connection.execute(f"INSERT INTO {kind}_fts (rowid, {text_columns}) "
+                                    f"SELECT rowid, {text_columns} FROM {kind} WHERE {stored}", (author.lower(),))
+
+    def mark_removed(self, author, kind, content_ids):
+        # Flags deleted content, so later searches served from the archive don't show it as live
+        content_ids = list(content_ids)
+
+        with self.connection:
+            for start in range(0, len(content_ids), MAX_VARIABLES):
+                batch = content_ids[start:start + MAX_VARIABLES]
+                self.connection.execute(f"UPDATE {kind} SET removed = 1 "
+                                        f"WHERE author = ? AND id IN ({', '.join('?' for _ in batch)})",
+                                        [author.lower()] + batch)
+
+    def search(self, kind, author, search_text, filters, by_id=False):
+        # WHERE clause and parameters for the parts of the search that used to be sent to PushShift (search text,
+        # subreddit and time), and the position of the full-text query among the parameters. When a list of IDs is
+        # being checked the created index is kept out of the plan (+created), so the rows are looked up by ID.
+        query = "author = ?"
+        parameters = [author.lower()]
+
+        query += f" AND {'+' if by_id else ''}created {['>', '<'][filters['Time'][0]]} ?"
+        parameters.append(filters["Time"][1])
+
+        if filters["Subreddit"]:
+            query += " AND subreddit = ? COLLATE NOCASE"
+            parameters.append(filters["Subreddit"])
+
+        text_position = None
+        if search_text:
+            query += f" AND rowid IN (SELECT rowid FROM {kind}_fts WHERE {kind}_fts MATCH ?)"
+            text_position = len(parameters)
+            parameters.append(search_text)
+
+        return query, parameters, text_position
+
+    def execute_search(self, query, parameters, text_position):
+        # Search text that isn't a valid full-text query (stray quotes, "don't", "c++"...) is retried as plain words
+        try:
+            return self.connection.execute(query, parameters).fetchall()
+        except sqlite3.OperationalError:
+            if text_position is None:
+                raise
+
+            parameters = list(parameters)
+            parameters[text_position] = " ".join('"' + word.replace('"', '""') + '"'
+                                                 for word in parameters[text_position].split())
+
+            return self.connection.execute(query, parameters).fetchall()
+
+    def load(self, kind, author, search_text, filters):
+        # Applies the search locally and returns the matches newest first as a record store. NULL columns come back
+        # as unknown values.
+        columns = POST_COLUMNS if kind == "posts" else COMMENT_COLUMNS
+        where, parameters, text_position = self.search(kind, author, search_text, filters)
+
+        records = RecordStore(kind)
+        rows = self.execute_search(f"SELECT {', '.join(columns)} FROM {kind} WHERE {where} ORDER BY created DESC",
+                                   parameters, text_position)
+
+        for row in rows:
+            content = dict(zip(columns, row))
+            records.append(content["id"], content["created"], content["subreddit"] or "", content["permalink"] or "",
+                           content, score=content["score"], edited=content["edited"], awarded=content["awarded"],
+                           removed=content["removed"])
+
+        return records
+
+    def matching_ids(self, kind, author, content_ids, search_text, filters):
+        # Which of the given stored IDs the search matches. Long lists are matched against the whole search at once
+        # instead of a batch of IDs at a time.
+        if len(content_ids) > MAX_VARIABLES * 10:
+            where, parameters, text_position = self.search(kind, author, search_text, filters)
+            rows = self.execute_search(f"SELECT id FROM {kind} WHERE {where}", parameters, text_position)
+
+            return {row[0] for row in rows}.intersection(content_ids)
+
+        where, parameters, text_position = self.search(kind, author, search_text, filters, by_id=True)
+        matches = set()
+
+        for start in range(0, len(content_ids), MAX_VARIABLES):
+            batch = list(content_ids[start:start + MAX_VARIABLES])
+            query = f"SELECT id FROM {kind} WHERE {where} AND id IN ({', '.join('?' for _ in batch)})"
+
+            matches.update(row[0] for row in self.execute_search(query, parameters + batch, text_position))
+
+        return matches
+
+    def matching_rows(self, author, records, rows, search_text, filters):
+        # The given record store rows whose archived copies the search matches
+        row_list = rows.tolist()
+        matches = self.matching_ids(records.kind, author, [records.ids[row] for row in row_list], search_text, filters)
+
+        return rows[numpy.array([records.ids[row] in matches for row in row_list], dtype=bool)]
+
+    def close(self):
+        self.connection.close()
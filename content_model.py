@@ -0,0 +1,303 @@
+import bisect
+import datetime
+import textwrap
+from PySide2.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide2.QtGui import QColor
+from filter_engine import sort_key
+
+LINK_TEXT = "L͟i͟n͟k͟"
+TEXT_LABELS = {"title": "Title", "selftext": "SelfText", "body": "Body"}
+HEADER_LABELS = ["ID", "Created On"]
+
+# Each index carries the record store row of the item it belongs to, shifted left by TAG_BITS. The low bits say how
+# deep it is: 0 for the item itself, 1 for one of its detail rows, and 2 + n for a line under its nth detail row.
+TAG_BITS = 4
+TAG_MASK = (1 << TAG_BITS) - 1
+MAX_REMOVED_RUNS = 50
+
+
+class ContentModel(QAbstractItemModel):
+    # Results pane model over the record store the gather threads fill. Only the store rows on display are kept, and
+    # the detail rows of an item (wrapped text, subreddit, score...) are worked out when the view asks for them, which
+    # it only does once the item is expanded or scrolled into view. Rows are kept ordered by their sort key, so rows
+    # streamed in while a search is still running land where the finished search would put them.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.records = None
+        self.sort = 0
+        self.rows = []
+        self.keys = []
+        self.row_keys = {}
+        self.sequence = 0
+        self.removed = set()
+        self.visited = set()
+        self.wrapped = {}
+
+    def set_records(self, records, sort=None):
+        self.beginResetModel()
+
+        self.records = records
+        self.sort = sort if sort is not None else self.sort
+        self.rows = []
+        self.keys = []
+        self.row_keys = {}
+        self.sequence = 0
+        self.removed = set()
+        self.visited = set()
+        self.wrapped = {}
+
+        self.endResetModel()
+
+    def clear(self, sort=None):
+        self.set_records(None, sort)
+
+    def append_rows(self, records, rows):
+        # Adds rows in sort order. A batch that sorts after everything already shown is inserted in one go.
+        if records is not self.records:
+            self.set_records(records)
+
+        rows = [row for row in rows if row not in self.row_keys]
+        if not rows:
+            return
+
+        keys = [sort_key(records, row, self.sort, self.sequence + index) for index, row in enumerate(rows)]
+        self.sequence += len(rows)
+        batch = sorted(zip(keys, rows))
+
+        if not self.keys or batch[0][0] > self.keys[-1]:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(batch) - 1)
+            for key, row in batch:
+                self.row_keys[row] = key
+                self.keys.append(key)
+                self.rows.append(row)
+            self.endInsertRows()
+            return
+
+        for key, row in batch:
+            position = bisect.bisect_left(self.keys, key)
+
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.row_keys[row] = key
+            self.keys.insert(position, key)
+            self.rows.insert(position, row)
+            self.endInsertRows()
+
+    def remove_positions(self, positions):
+        # Removes items by their position in the view, one contiguous run at a time from the bottom up. A selection
+        # scattered over many runs is removed with a single reset instead.
+        positions = sorted(set(positions), reverse=True)
+        runs = []
+
+        while positions:
+            last = first = positions.pop(0)
+            while positions and positions[0] == first - 1:
+                first = positions.pop(0)
+
+            runs.append((first, last))
+
+        if len(runs) > MAX_REMOVED_RUNS:
+            self.beginResetModel()
+            for first, last in runs:
+                self.remove_run(first, last)
+            self.endResetModel()
+            return
+
+        for first, last in runs:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.remove_run(first, last)
+            self.endRemoveRows()
+
+    def remove_run(self, first, last):
+        for row in self.rows[first:last + 1]:
+            del self.row_keys[row]
+
+        del self.rows[first:last + 1]
+        del self.keys[first:last + 1]
+
+    def position(self, row):
+        # Where a store row is shown, or None if it isn't
+        if row not in self.row_keys:
+            return
+
+        return bisect.bisect_left(self.keys, self.row_keys[row])
+
+    def store_row(self, position):
+        return self.rows[position]
+
+    def content_id(self, position):
+        return self.records.ids[self.rows[position]]
+
+    def is_removed(self, row):
+        return row in self.removed or bool(self.records.value("removed", row))
+
+    def mark_removed(self, row):
+        self.removed.add(row)
+
+        if row in self.row_keys:
+            top_left = self.top_index(row)
+            self.dataChanged.emit(top_left, top_left.siblingAtColumn(1))
+
+    def top_index(self, row):
+        position = self.position(row)
+
+        return self.index(position, 0) if position is not None else QModelIndex()
+
+    def link(self, index):
+        # The URL behind a link row, or None for any other row
+        if not index.isValid() or index.internalId() & TAG_MASK != 1:
+            return
+
+        row = index.internalId() >> TAG_BITS
+        if self.details(row)[index.row()] != "link":
+            return
+
+        return f"https://www.reddit.com{self.records.value('permalink', row)}"
+
+    def mark_visited(self, index):
+        self.visited.add(index.internalId() >> TAG_BITS)
+        self.dataChanged.emit(index, index)
+
+    def details(self, row):
+        details = [field for field in self.records.text_fields
+                   if field != "selftext" or self.records.value(field, row)]
+
+        return details + ["subreddit", "score", "edited", "awarded", "link"]
+
+    def lines(self, row, field):
+        if (row, field) not in self.wrapped:
+            self.wrapped[(row, field)] = textwrap.wrap(self.records.value(field, row), 55)
+
+        return self.wrapped[(row, field)]
+
+    def detail_text(self, row, field):
+        if field in TEXT_LABELS:
+            return TEXT_LABELS[field]
+        if field == "link":
+            return LINK_TEXT
+
+        value = self.records.value(field, row)
+        if field == "subreddit":
+            return f"Subreddit: r/{value}"
+        if field == "score":
+            return f"Score: {value if value is not None else 'Unknown'}"
+
+        value = "Unknown" if value is None else "Yes" if value else "No"
+        return f"{field.capitalize()}: {value}"
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        if not parent.isValid():
+            return self.createIndex(row, column, self.rows[row] << TAG_BITS)
+
+        tag = parent.internalId() & TAG_MASK
+        base = parent.internalId() & ~TAG_MASK
+
+        if tag == 0:
+            return self.createIndex(row, column, base | 1)
+
+        return self.createIndex(row, column, base | (2 + parent.row()))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+
+        tag = index.internalId() & TAG_MASK
+        row = index.internalId() >> TAG_BITS
+
+        if tag == 0:
+            return QModelIndex()
+        if tag == 1:
+            return self.createIndex(self.position(row), 0, row << TAG_BITS)
+
+        return self.createIndex(tag - 2, 0, (row << TAG_BITS) | 1)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.rows)
+        if parent.column() != 0:
+            return 0
+
+        tag = parent.internalId() & TAG_MASK
+        row = parent.internalId() >> TAG_BITS
+
+        if tag == 0:
+            return len(self.details(row))
+        if tag == 1:
+            field = self.details(row)[parent.row()]
+            return len(self.lines(row, field)) if field in TEXT_LABELS else 0
+
+        return 0
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.rows)
+        if parent.column() != 0:
+            return False
+
+        tag = parent.internalId() & TAG_MASK
+        if tag == 0:
+            return True
+        if tag == 1:
+            return self.details(parent.internalId() >> TAG_BITS)[parent.row()] in TEXT_LABELS
+
+        return False
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADER_LABELS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADER_LABELS[section]
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.internalId() & TAG_MASK == 0:
+            return super().flags(index)  # Enabled and selectable
+
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return
+
+        tag = index.internalId() & TAG_MASK
+        row = index.internalId() >> TAG_BITS
+
+        if tag == 0:
+            return self.item_data(index, row, role)
+        if index.column() != 0:
+            return
+
+        if tag == 1:
+            field = self.details(row)[index.row()]
+
+            if role == Qt.DisplayRole:
+                return self.detail_text(row, field)
+            if field == "link" and role == Qt.ForegroundRole:
+                return QColor(85, 26, 139) if row in self.visited else QColor(0, 0, 238)
+            if field == "link" and role == Qt.StatusTipRole:
+                return f"https://www.reddit.com{self.records.value('permalink', row)}"
+
+            return
+
+        if role == Qt.DisplayRole:
+            return self.lines(row, self.details(row)[tag - 2])[index.row()]
+
+    def item_data(self, index, row, role):
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return self.records.ids[row]
+
+            created = datetime.datetime.fromtimestamp(self.records.value("created", row))
+            return created.strftime('%m/%d/%Y %I:%M %p')
+
+        if role == Qt.BackgroundRole and index.row() % 2 == 0:
+            return QColor(220, 220, 220)
+        if role == Qt.ForegroundRole and index.column() == 0 and self.is_removed(row):
+            return QColor(255, 0, 0)
+        if role == Qt.StatusTipRole and index.column() == 0:
+            return "Removed Content" if self.is_removed(row) else "Reddit Content"
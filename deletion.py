@@ -0,0 +1,84 @@
+import concurrent.futures
+import threading
+from rate_limit import TokenBucket
+from retry import RetryPolicy
+
+REMOVED_TEXT = "[removed]"
+
+
+class ContentDeleter:
+    # Deletes content over a small pool of workers that share one rate-limit budget, so bulk deletes run at the full
+    # API rate instead of one round-trip at a time. Every request (the overwrite edit and the delete) first takes a
+    # token from the budget, and is retried if it fails for a transient reason. With overwrite off, the edit is skipped
+    # and each item costs a single request. Each worker logs in with its own PRAW instance from make_reddit, since
+    # PRAW instances can't be shared between threads.
+    def __init__(self, make_reddit, overwrite=True, stopped=lambda: False, workers=4, budget=None, retry=None):
+        self.make_reddit = make_reddit
+        self.local = threading.local()
+        self.overwrite = overwrite
+        self.stopped = stopped
+        self.workers = workers
+        self.budget = budget if budget is not None else TokenBucket(capacity=workers)
+        self.retry = retry if retry is not None else RetryPolicy(stopped=stopped)
+
+    def client(self):
+        if not hasattr(self.local, "reddit"):
+            self.local.reddit = self.make_reddit()
+
+        return self.local.reddit
+
+    def request(self, action):
+        return self.retry.call(self.attempt, action)
+
+    def attempt(self, action):
+        if not self.budget.acquire(self.stopped):
+            return False
+
+        action()
+        self.budget.update_from_reddit(self.client())
+
+        return True
+
+    def delete_one(self, kind, content_id):
+        # Returns False if the worker was stopped before the delete went out
+        reddit = self.client()
+        content = reddit.comment(content_id) if kind == "comments" else reddit.submission(content_id)
+
+        if self.overwrite:
+            try:
+                if not self.request(lambda: content.edit(REMOVED_TEXT)):
+                    return False
+            except Exception:
+                # Link posts have no text to overwrite, so only comments fail here
+                if kind == "comments":
+                    raise
+
+        return self.request(content.delete)
+
+    def delete(self, targets):
+        # Deletes (kind, content_id) targets, yielding (kind, content_id, error) for each as it completes, error being
+        # None when it was deleted. At most two items per worker are queued at a time, so stopping doesn't leave a
+        # long queue to drain.
+        targets = iter(targets)
+        pending = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                while len(pending) < self.workers * 2 and not self.stopped():
+                    target = next(targets, None)
+                    if target is None:
+                        break
+
+                    pending[executor.submit(self.delete_one, *target)] = target
+
+                if not pending:
+                    return
+
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    kind, content_id = pending.pop(future)
+
+                    if future.exception() is not None:
+                        yield kind, content_id, future.exception()
+                    elif future.result():
+                        yield kind, content_id, None
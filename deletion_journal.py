@@ -0,0 +1,127 @@
+import datetime
+import json
+import os
+import time
+
+JOBS_DIRECTORY = "jobs"
+CHECKPOINT_INTERVAL = 1.0  # Most seconds between forcing the journal to disk
+DONE_OUTCOMES = ["deleted", "skipped"]
+
+
+class DeletionJournal:
+    # Append-only JSON Lines record of one deletion job: a header line with the author, overwrite setting and every
+    # (kind, ID) target, then one line per processed item with its outcome, and a final line once the job has finished.
+    # Each line is flushed as it's written and the file is synced at most once per CHECKPOINT_INTERVAL, so after a crash
+    # or a stop the job can be resumed with only the items that weren't deleted yet. A line cut short by a crash is
+    # ignored when the journal is read back.
+    def __init__(self, path):
+        self.path = path
+        self.author = None
+        self.overwrite = True
+        self.targets = []
+        self.outcomes = {}
+        self.finished = False
+
+        self.file = None
+        self.synced = 0.0
+        self.torn = False
+
+        if os.path.isfile(path):
+            self.read()
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                self.torn = not line.endswith("\n")
+
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+
+                if "targets" in entry:
+                    self.author = entry["author"]
+                    self.overwrite = entry["overwrite"]
+                    self.targets = [tuple(target) for target in entry["targets"]]
+                elif "outcome" in entry:
+                    self.outcomes[(entry["kind"], entry["id"])] = entry["outcome"]
+                elif entry.get("finished"):
+                    self.finished = True
+
+    def start(self, author, targets, overwrite):
+        self.author = author.lower()
+        self.overwrite = overwrite
+        self.targets = [tuple(target) for target in targets]
+
+        self.write({"author": self.author, "overwrite": overwrite, "created": int(time.time()),
+                    "targets": self.targets})
+        self.sync()
+
+    def remaining(self):
+        # Targets not deleted yet. Items that failed are tried again.
+        return [target for target in self.targets if self.outcomes.get(target) not in DONE_OUTCOMES]
+
+    def record(self, kind, content_id, outcome, error=None):
+        self.outcomes[(kind, content_id)] = outcome
+
+        entry = {"kind": kind, "id": content_id, "outcome": outcome}
+        if error is not None:
+            entry["error"] = str(error)
+
+        self.write(entry)
+
+        if time.monotonic() - self.synced >= CHECKPOINT_INTERVAL:
+            self.sync()
+
+    def finish(self):
+        self.finished = True
+        self.write({"finished": int(time.time())})
+        self.close()
+
+    def write(self, entry):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+
+        # A line cut short by a crash is ended first, so it doesn't swallow this entry
+        if self.torn:
+            self.file.write("\n")
+            self.torn = False
+
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    def sync(self):
+        if self.file is not None:
+            os.fsync(self.file.fileno())
+
+        self.synced = time.monotonic()
+
+    def close(self):
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+
+def new_journal(author, directory=JOBS_DIRECTORY):
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    created = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return DeletionJournal(os.path.join(directory, f"{author.lower()}-{created}.jsonl"))
+
+
+def unfinished_journals(author, directory=JOBS_DIRECTORY):
+    # The author's deletion jobs that were interrupted or stopped, newest first
+    if not os.path.isdir(directory):
+        return []
+
+    journals = []
+    for file_name in sorted(os.listdir(directory), reverse=True):
+        if file_name.startswith(f"{author.lower()}-") and file_name.endswith(".jsonl"):
+            journal = DeletionJournal(os.path.join(directory, file_name))
+
+            if journal.author == author.lower() and not journal.finished and journal.remaining():
+                journals.append(journal)
+
+    return journals
@@ -0,0 +1,152 @@
+import concurrent.futures
+import queue
+import threading
+from rate_limit import TokenBucket
+from retry import RetryPolicy
+
+BATCH_SIZE = 100  # Most IDs reddit.info accepts per request
+REMOVED_TEXT = ["[removed]", "[deleted]"]
+
+
+def content_fields(content_info, text_field):
+    text = getattr(content_info, text_field)
+
+    return {"score": content_info.score,
+            "awarded": content_info.distinguished is not None,
+            "edited": content_info.edited is not False,
+            "removed": text in REMOVED_TEXT,
+            text_field: text}
+
+
+class ContentEnricher:
+    # Looks up gathered IDs through reddit.info on a background thread so that enrichment overlaps the PushShift crawl.
+    # IDs are queued as soon as their page arrives and full batches are handed to a small pool, so several batches
+    # can be in flight at once. Every request first takes a token from the shared rate-limit budget, and batches that
+    # fail for a transient reason are retried. PRAW instances can't be shared between threads, so each worker logs in
+    # with its own from make_reddit and only the budget is shared.
+    def __init__(self, make_reddit, kind, stopped=lambda: False, on_batch=lambda num_complete, num_queued: None,
+                 workers=4, budget=None, retry=None):
+        self.make_reddit = make_reddit
+        self.local = threading.local()
+        self.prefix = "t3_" if kind == "posts" else "t1_"
+        self.text_field = "selftext" if kind == "posts" else "body"
+        self.stopped = stopped
+        self.on_batch = on_batch
+        self.budget = budget if budget is not None else TokenBucket(capacity=workers)
+        self.retry = retry if retry is not None else RetryPolicy(stopped=stopped)
+
+        self.id_queue = queue.Queue()
+        self.completed = queue.Queue()
+        self.closed = False
+        self.queued = 0
+        self.results = {}
+        self.futures = []
+        self.failed = False
+        self.cancelled = False
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def put(self, content_id):
+        self.queued += 1
+        self.id_queue.put(content_id)
+
+    def close(self):
+        # No more IDs are coming, so the last partial batch can go out
+        if not self.closed:
+            self.closed = True
+            self.id_queue.put(None)
+
+    def done(self):
+        return self.closed and not self.thread.is_alive() and all(future.done() for future in self.futures)
+
+    def drain(self, timeout=0):
+        # Results of the batches completed since the last call, one dict per batch. Waits up to timeout seconds for
+        # the first one if none are ready.
+        batches = []
+
+        try:
+            batches.append(self.completed.get(timeout=timeout) if timeout else self.completed.get_nowait())
+            while True:
+                batches.append(self.completed.get_nowait())
+        except queue.Empty:
+            pass
+
+        return batches
+
+    def finish(self):
+        # Flushes the last partial batch and waits for every batch in flight. The first error raised by reddit.info is
+        # re-raised here.
+        self.close()
+        self.thread.join()
+        self.executor.shutdown(wait=True)
+
+        for future in self.futures:
+            future.result()
+
+        return self.results
+
+    def shutdown(self):
+        # Stops the dispatcher and drops any batches not started yet, for when the gather ends early. Does nothing
+        # once finish has returned.
+        self.cancelled = True
+        self.close()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self):
+        batch = []
+
+        while True:
+            content_id = self.id_queue.get()
+
+            if content_id is not None:
+                batch.append(content_id)
+
+            if batch and (len(batch) == BATCH_SIZE or content_id is None):
+                if self.failed or self.cancelled:
+                    return
+
+                self.futures.append(self.executor.submit(self.enrich, batch))
+                batch = []
+
+            if content_id is None:
+                return
+
+    def client(self):
+        if not hasattr(self.local, "reddit"):
+            self.local.reddit = self.make_reddit()
+
+        return self.local.reddit
+
+    def fetch(self, batch):
+        if not self.budget.acquire(self.stopped):
+            return
+
+        reddit = self.client()
+        content_info = list(reddit.info(fullnames=[self.prefix + content_id for content_id in batch]))
+        self.budget.update_from_reddit(reddit)
+
+        return content_info
+
+    def enrich(self, batch):
+        if self.failed or self.stopped():
+            return
+
+        try:
+            content_info = self.retry.call(self.fetch, batch)
+        except Exception:
+            self.failed = True
+            raise
+
+        if content_info is None:
+            return
+
+        fields = {info.id: content_fields(info, self.text_field) for info in content_info}
+        self.results.update(fields)
+        self.completed.put(fields)
+
+        self.on_batch(len(self.results), self.queued)
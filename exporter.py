@@ -0,0 +1,206 @@
+import csv
+import datetime
+import html
+import json
+import numpy
+from record_store import RecordStore
+
+CHUNK_SIZE = 1000  # Records formatted and written at a time
+ROW_GROUP_SIZE = 65536  # Rows per Parquet row group / Arrow record batch
+
+
+def export_columns(records):
+    return ["id", "created"] + records.text_fields + ["subreddit", "score", "edited", "awarded", "removed", "link"]
+
+
+def export_values(records, row):
+    # One record in export_columns order, with its full text and native values. Unknown values are None, and created
+    # is an ISO 8601 UTC time.
+    created = datetime.datetime.fromtimestamp(records.created[row], datetime.timezone.utc).isoformat()
+    known = records.known_flags
+
+    return ([records.ids[row], created]
+            + [records.text[field][row] for field in records.text_fields]
+            + [records.subreddit_names[records.subreddits[row]],
+               records.score[row] if known["score"][row] else None]
+            + [bool(records.flags[field][row]) if known[field][row] else None
+               for field in ["edited", "awarded", "removed"]]
+            + [f"https://www.reddit.com{records.permalinks[row]}"])
+
+
+def chunks(records, rows, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(rows), chunk_size):
+        yield [export_values(records, row) for row in rows[start:start + chunk_size]]
+
+
+def json_lines(records, chunk):
+    columns = export_columns(records)
+
+    return [json.dumps(dict(zip(columns, values)), ensure_ascii=False) for values in chunk]
+
+
+def write_csv(records, rows, file):
+    writer = csv.writer(file)
+    writer.writerow(export_columns(records))
+
+    for chunk in chunks(records, rows):
+        writer.writerows(["" if value is None else value for value in values] for values in chunk)
+
+
+def write_jsonl(records, rows, file):
+    for chunk in chunks(records, rows):
+        file.write("".join(line + "\n" for line in json_lines(records, chunk)))
+
+
+def write_json(records, rows, file):
+    # A single JSON array, written a chunk at a time
+    file.write("[")
+
+    separator = "\n"
+    for chunk in chunks(records, rows):
+        file.write(separator + ",\n".join(json_lines(records, chunk)))
+        separator = ",\n"
+
+    file.write("\n]\n")
+
+
+def write_html(records, rows, file):
+    columns = export_columns(records)
+
+    file.write("<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"></head>\n<body>\n<table border=\"1\">\n")
+    file.write("<thead><tr>" + "".join(f"<th>{html.escape(column)}</th>" for column in columns) + "</tr></thead>\n")
+    file.write("<tbody>\n")
+
+    for chunk in chunks(records, rows):
+        file.write("".join("<tr>" + "".join(f"<td>{html_value(value)}</td>" for value in values) + "</tr>\n"
+                           for values in chunk))
+
+    file.write("</tbody>\n</table>\n</body>\n</html>\n")
+
+
+def html_value(value):
+    if value is None:
+        return ""
+
+    return html.escape(str(value)).replace("\n", "<br>")
+
+
+def import_pyarrow():
+    # pyarrow is only needed for the columnar formats, so it's imported when one is used
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet and Arrow files need pyarrow (pip install pyarrow)")
+
+    return pyarrow
+
+
+def arrow_schema(pyarrow, records):
+    fields = [pyarrow.field("id", pyarrow.string()),
+              pyarrow.field("created", pyarrow.timestamp("s", tz="UTC"))]
+    fields += [pyarrow.field(field, pyarrow.string()) for field in records.text_fields]
+    fields += [pyarrow.field("subreddit", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+               pyarrow.field("score", pyarrow.int64())]
+    fields += [pyarrow.field(field, pyarrow.bool_()) for field in ["edited", "awarded", "removed"]]
+    fields += [pyarrow.field("link", pyarrow.string())]
+
+    return pyarrow.schema(fields)
+
+
+def arrow_tables(pyarrow, records, rows, schema):
+    # The rows as Arrow tables of up to ROW_GROUP_SIZE rows, built from the store's typed columns
+    rows = numpy.asarray(rows, dtype=numpy.int64)
+    created = records.column("created")
+    subreddits = numpy.frombuffer(records.subreddits, dtype=numpy.int64) if len(records) else numpy.zeros(0, int)
+    subreddit_names = pyarrow.array(records.subreddit_names, pyarrow.string())
+    info = {field: (records.column(field), records.known(field)) for field in ["score", "edited", "awarded",
+                                                                                "removed"]}
+
+    for start in range(0, len(rows), ROW_GROUP_SIZE):
+        chunk = rows[start:start + ROW_GROUP_SIZE]
+        row_list = chunk.tolist()
+
+        columns = [pyarrow.array([records.ids[row] for row in row_list], pyarrow.string()),
+                   pyarrow.array(created[chunk], pyarrow.timestamp("s", tz="UTC"))]
+        columns += [pyarrow.array([records.text[field][row] for row in row_list], pyarrow.string())
+                    for field in records.text_fields]
+        columns += [pyarrow.DictionaryArray.from_arrays(subreddits[chunk].astype(numpy.int32), subreddit_names)]
+        columns += [pyarrow.array(values[chunk], mask=~known[chunk]) for values, known in info.values()]
+        columns += [pyarrow.array([f"https://www.reddit.com{records.permalinks[row]}" for row in row_list],
+                                  pyarrow.string())]
+
+        yield pyarrow.Table.from_arrays(columns, schema=schema)
+
+
+def write_parquet(records, rows, path):
+    pyarrow = import_pyarrow()
+    schema = arrow_schema(pyarrow, records)
+
+    with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for table in arrow_tables(pyarrow, records, rows, schema):
+            writer.write_table(table)
+
+
+def write_arrow(records, rows, path):
+    pyarrow = import_pyarrow()
+    schema = arrow_schema(pyarrow, records)
+    options = pyarrow.ipc.IpcWriteOptions(compression="zstd")
+
+    with pyarrow.ipc.new_file(path, schema, options=options) as writer:
+        for table in arrow_tables(pyarrow, records, rows, schema):
+            writer.write_table(table)
+
+
+def import_records(path):
+    # Loads a Parquet or Arrow dump back into a record store, one record batch at a time
+    pyarrow = import_pyarrow()
+
+    if path.endswith(".parquet"):
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        names = parquet_file.schema_arrow.names
+        # A dump of zero rows has no row groups, which iter_batches can't read
+        batches = parquet_file.iter_batches(batch_size=ROW_GROUP_SIZE) if parquet_file.num_row_groups else []
+    else:
+        reader = pyarrow.ipc.open_file(path)
+        names = reader.schema.names
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+
+    records = RecordStore("comments" if "body" in names else "posts")
+
+    for batch in batches:
+        created = batch.column("created").cast(pyarrow.timestamp("s", tz="UTC")).cast(pyarrow.int64())
+        info = {}
+        for field, empty in [("score", 0), ("edited", False), ("awarded", False), ("removed", False)]:
+            info[field] = (batch.column(field).fill_null(empty).to_numpy(zero_copy_only=False),
+                           batch.column(field).is_valid().to_numpy(zero_copy_only=False))
+
+        records.extend(batch.column("id").to_pylist(),
+                       created.to_numpy(zero_copy_only=False),
+                       [subreddit or "" for subreddit in batch.column("subreddit").to_pylist()],
+                       [link.replace("https://www.reddit.com", "", 1) for link in batch.column("link").to_pylist()],
+                       {field: batch.column(field).to_pylist() for field in records.text_fields},
+                       info)
+
+    return records
+
+
+EXPORT_FORMATS = {"csv": write_csv,
+                  "jsonl": write_jsonl,
+                  "json": write_json,
+                  "html": write_html}
+
+COLUMNAR_FORMATS = {"parquet": write_parquet,
+                    "arrow": write_arrow}
+
+
+def export_records(records, rows, path, export_format):
+    # Writes the given store rows, in order, to path. Records are formatted a chunk at a time, so memory use doesn't
+    # grow with the number of rows.
+    if export_format in COLUMNAR_FORMATS:
+        COLUMNAR_FORMATS[export_format](records, rows, path)
+        return
+
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        EXPORT_FORMATS[export_format](records, rows, file)
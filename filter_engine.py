@@ -0,0 +1,70 @@
+import numpy
+
+SCORE_RANGE = (-9999999, 9999999)  # The score spin boxes' full range, i.e. no score filter
+
+
+def tri_state_mask(values, known, setting, drop_unknown):
+    # Combo box settings: 0 = don't care, 1 = must be set, 2 = must not be set
+    if setting == 0:
+        return numpy.ones(len(values), dtype=bool)
+
+    mask = values if setting == 1 else ~values
+
+    if drop_unknown:
+        return known & mask
+
+    return ~known | mask
+
+
+def compile_mask(store, filters, rows=None):
+    # Turns the search filters into one boolean mask over every row of the record store, or over the given rows.
+    # Content reddit.info couldn't find keeps an unknown score and removed state, but can't satisfy an awarded or
+    # edited filter.
+    def column(field):
+        return store.column(field) if rows is None else store.column(field)[rows]
+
+    def known(field):
+        return store.known(field) if rows is None else store.known(field)[rows]
+
+    score = column("score")
+    mask = ~known("score") | ((score >= filters["Score"][0]) & (score <= filters["Score"][1]))
+
+    mask &= tri_state_mask(column("awarded"), known("awarded"), filters["Awarded"], True)
+    mask &= tri_state_mask(column("edited"), known("edited"), filters["Edited"], True)
+    mask &= tri_state_mask(column("removed"), known("removed"), filters["Removed"], False)
+
+    return mask
+
+
+def uses_reddit_state(filters):
+    # Whether the results depend on what reddit.info reports (score, awarded, edited, removed), which can have changed
+    # since the content was archived
+    return tuple(filters["Score"]) != SCORE_RANGE or filters["Sort"] == 1 or \
+        any(filters[field] for field in ["Awarded", "Edited", "Removed"])
+
+
+def sort_order(store, rows, sort):
+    # The given rows newest first (sort 0) or highest score first (sort 1), with unknown scores kept last. Equal
+    # scores are ordered newest first.
+    created = store.column("created")[rows]
+
+    if sort == 0:
+        return rows[numpy.argsort(-created, kind="stable")]
+
+    known = store.known("score")[rows]
+    by_score = numpy.lexsort((-created[known], -store.column("score")[rows][known]))
+    unknown = numpy.argsort(-created[~known], kind="stable")
+
+    return numpy.concatenate([rows[known][by_score], rows[~known][unknown]])
+
+
+def sort_key(store, row, sort, sequence):
+    # Key that puts a single row where sort_order would, for views that insert rows as they arrive. The sequence
+    # number breaks any remaining ties in arrival order.
+    created = store.value("created", row)
+
+    if sort == 0:
+        return -created, sequence
+
+    score = store.value("score", row)
+    return (0, -score, -created, sequence) if score is not None else (1, 0, -created, sequence)
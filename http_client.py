@@ -0,0 +1,75 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+shared_client = None
+shared_client_lock = threading.Lock()
+
+
+class HttpClient:
+    # One pooled requests session for every PushShift-backed call in the app. Connections are kept alive between pages
+    # so a long crawl only pays for the TCP/TLS handshake once per pooled connection.
+    def __init__(self, pool_size=8, timeout=30, user_agent="Reddit Content Manager"):
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": user_agent,
+                                     "Accept-Encoding": "gzip, deflate",
+                                     "Connection": "keep-alive"})
+
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_received = 0  # As sent over the wire, i.e. compressed when the server gzips the response
+        self.bytes_decoded = 0
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(url, **kwargs)
+
+        with self.lock:
+            self.request_count += 1
+            self.bytes_received += int(response.headers.get("Content-Length", len(response.content)))
+            self.bytes_decoded += len(response.content)
+
+        return response
+
+    def get_json(self, url, **kwargs):
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+
+        return response.json()
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.request_count,
+                    "bytes_received": self.bytes_received,
+                    "bytes_decoded": self.bytes_decoded}
+
+    def close(self):
+        self.session.close()
+
+
+def get_shared_client():
+    global shared_client
+
+    with shared_client_lock:
+        if shared_client is None:
+            shared_client = HttpClient()
+
+        return shared_client
+
+
+def configure_shared_client(**kwargs):
+    # Replaces the shared client, e.g. to change the pool size or timeout. Takes the same arguments as HttpClient.
+    global shared_client
+
+    with shared_client_lock:
+        if shared_client is not None:
+            shared_client.close()
+
+        shared_client = HttpClient(**kwargs)
+
+        return shared_client
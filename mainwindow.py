@@ -71,10 +71,8 @@ class UIMainWindow(object):
         self.submission_search_bar = QtWidgets.QLineEdit(self.verticalLayoutWidget_2)
         self.submission_search_bar.setObjectName("submission_search_bar")
         self.submission_layout.addWidget(self.submission_search_bar)
-        self.content_tree = QtWidgets.QTreeWidget()
-        self.content_tree.setColumnCount(2)
-        self.content_tree.setHeaderLabels(["ID", "Created On"])
-        self.content_tree.setColumnWidth(0,505)
+        self.content_tree = QtWidgets.QTreeView()
+        self.content_tree.setUniformRowHeights(True)
         self.content_tree.setSelectionMode(QtWidgets.QAbstractItemView.MultiSelection)
         self.submission_layout.addWidget(self.content_tree)
         self.submission_progress_bar = QtWidgets.QProgressBar()
@@ -90,9 +88,15 @@ class UIMainWindow(object):
         self.submission_dump_button = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
         self.submission_dump_button.setObjectName("submission_dump_button")
         self.submission_button_layout.addWidget(self.submission_dump_button)
+        self.submission_load_button = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.submission_load_button.setObjectName("submission_load_button")
+        self.submission_button_layout.addWidget(self.submission_load_button)
         self.submission_delete_button = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
         self.submission_delete_button.setObjectName("submission_delete_button")
         self.submission_button_layout.addWidget(self.submission_delete_button)
+        self.submission_resume_button = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.submission_resume_button.setObjectName("submission_resume_button")
+        self.submission_button_layout.addWidget(self.submission_resume_button)
         self.submission_clear_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
         self.submission_clear_btn.setObjectName("submission_clear_btn")
         self.submission_button_layout.addWidget(self.submission_clear_btn)
@@ -184,6 +188,18 @@ class UIMainWindow(object):
         self.removed_combo = QtWidgets.QComboBox()
         self.removed_combo.addItems(["NA", "Yes", "No"])
         self.filter_layout.addRow(QtWidgets.QLabel("Removed"), self.removed_combo)
+        self.search_mode_combo = QtWidgets.QComboBox()
+        self.search_mode_combo.addItems(["Text", "Regex", "Fuzzy"])
+        self.filter_layout.addRow(QtWidgets.QLabel("Search Mode"), self.search_mode_combo)
+        self.stream_check = QtWidgets.QCheckBox("Show results while searching")
+        self.stream_check.setChecked(True)
+        self.filter_layout.addRow(self.stream_check)
+        self.refresh_check = QtWidgets.QCheckBox("Refresh archived content when filtering by score or status")
+        self.refresh_check.setChecked(True)
+        self.filter_layout.addRow(self.refresh_check)
+        self.overwrite_check = QtWidgets.QCheckBox("Overwrite text before deleting")
+        self.overwrite_check.setChecked(True)
+        self.filter_layout.addRow(self.overwrite_check)
         self.main_layout.addWidget(self.filter_frame)
         main_window.setCentralWidget(self.centralwidget)
         self.menubar = QtWidgets.QMenuBar(main_window)
@@ -234,7 +250,9 @@ class UIMainWindow(object):
         self.submission_search_bar.setPlaceholderText(_translate("MainWindow", "Search For Text Within Content"))
         self.submission_search_button.setText(_translate("MainWindow", "Search"))
         self.submission_dump_button.setText(_translate("MainWindow", "Dump..."))
+        self.submission_load_button.setText(_translate("MainWindow", "Load..."))
         self.submission_delete_button.setText(_translate("MainWindow", "Delete"))
+        self.submission_resume_button.setText(_translate("MainWindow", "Resume Delete"))
         self.submission_clear_btn.setText(_translate("MainWindow", "Clear"))
         self.filter_label.setText(_translate("MainWindow", "Filters"))
         self.comment_radio.setText(_translate("MainWindow", "Comments"))
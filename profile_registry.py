@@ -0,0 +1,50 @@
+import os
+from PySide2.QtCore import QFileSystemWatcher, QObject, Signal
+
+PROFILES_DIRECTORY = "profiles"
+PROFILE_EXTENSIONS = [".rpf", ".txt"]
+
+
+class ProfileRegistry(QObject):
+    # In-memory index of the saved profiles, kept current by watching the profiles directory (inotify on Linux) instead
+    # of listing it on a timer. The directory is only read again when it changes, and profiles_changed is only emitted
+    # when that adds or removes a profile. Until the directory exists, its parent is watched for it to be created.
+    profiles_changed = Signal(list)
+
+    def __init__(self, directory=PROFILES_DIRECTORY, parent=None):
+        super().__init__(parent)
+
+        self.directory = directory
+        self.names = []
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.refresh)
+        self.refresh()
+
+    def scan(self):
+        if not os.path.isdir(self.directory):
+            return []
+
+        return sorted({os.path.splitext(file_name)[0] for file_name in os.listdir(self.directory)
+                       if os.path.splitext(file_name)[1].lower() in PROFILE_EXTENSIONS})
+
+    def watch(self):
+        # The watcher drops a directory once it's removed, so the watched paths are checked after every change
+        watched = self.watcher.directories()
+        parent = os.path.dirname(os.path.abspath(self.directory))
+
+        if os.path.isdir(self.directory):
+            if self.directory not in watched:
+                self.watcher.addPath(self.directory)
+            if parent in watched:
+                self.watcher.removePath(parent)
+        elif parent not in watched:
+            self.watcher.addPath(parent)
+
+    def refresh(self, path=None):
+        self.watch()
+
+        names = self.scan()
+        if names != self.names:
+            self.names = names
+            self.profiles_changed.emit(names)
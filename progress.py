@@ -0,0 +1,59 @@
+import datetime
+import time
+
+
+class ProgressReporter:
+    # Coalesces per-item progress from a worker thread into at most one status and progress signal per interval
+    # (10 per second by default), so long loops don't flood the GUI event loop with queued signals. Updating is just
+    # a counter and a clock check, and each flush adds the rate and an ETA to the status text.
+    def __init__(self, label, total, on_status, on_progress=lambda progress: None, interval=0.1):
+        self.label = label
+        self.total = total
+        self.on_status = on_status
+        self.on_progress = on_progress
+        self.interval = interval
+
+        self.done = 0
+        self.started = time.monotonic()
+        self.flushed = 0.0
+
+    def update(self, done, total=None):
+        # total can be passed along when it's still growing, like content queued for enrichment during a crawl
+        self.done = done
+        if total is not None:
+            self.total = total
+
+        now = time.monotonic()
+        if now - self.flushed >= self.interval:
+            self.flush(now)
+
+    def advance(self, amount=1):
+        self.update(self.done + amount)
+
+    def rate(self, now=None):
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def status(self, now=None):
+        rate = self.rate(now)
+
+        if not self.total:
+            return f"{self.label}... ({self.done} | {rate:.0f}/s)"
+
+        status = f"{self.label}... ({self.done}/{self.total} | {rate:.0f}/s"
+        if rate > 0 and self.done < self.total:
+            eta = datetime.timedelta(seconds=round((self.total - self.done) / rate))
+            status += f" | ETA {eta}"
+
+        return status + ")"
+
+    def flush(self, now=None):
+        self.flushed = now if now is not None else time.monotonic()
+
+        self.on_status(self.status(self.flushed))
+        if self.total:
+            self.on_progress(self.done / self.total * 100)
+
+    def finish(self):
+        self.flush()
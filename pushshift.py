@@ -0,0 +1,137 @@
+import concurrent.futures
+import time
+from http_client import get_shared_client
+from retry import RetryPolicy
+
+SEARCH_URL = "https://api.pushshift.io/reddit/search/{kind}/"
+WINDOW_GRID = 60 * 60  # Window edges are whole hours so that a re-run asks for exactly the same pages
+INGEST_LAG = 3 * 24 * 60 * 60  # Seconds after creation that PushShift may still be ingesting content
+
+
+class PushShiftCrawler:
+    # Splits the requested time range into windows and pages through them concurrently. Each window is paged newest
+    # first, so concatenating the windows from newest to oldest keeps the whole result sorted by created_utc. A page
+    # that fails for a transient reason is retried on its own, so the crawl carries on from where it was.
+    def __init__(self, kind, author, workers=4, windows_per_worker=4, page_size=1000, stopped=lambda: False,
+                 client=None, cache=None, retry=None):
+        self.kind = kind
+        self.author = author
+        self.workers = workers
+        self.windows_per_worker = windows_per_worker
+        self.page_size = page_size
+        self.stopped = stopped
+        self.client = client if client is not None else get_shared_client()
+        self.cache = cache
+        self.retry = retry if retry is not None else RetryPolicy(stopped=stopped)
+
+    def search_link(self, sort, after, before=None, limit=None):
+        push_link = SEARCH_URL.format(kind=self.kind) + \
+                    f"?sort_type=created_utc" \
+                    f"&sort={sort}" \
+                    f"&author={self.author}" \
+                    f"&after={after}" \
+                    f"&limit={limit or self.page_size}"
+
+        if before is not None:
+            push_link += f"&before={before}"
+
+        return push_link
+
+    def get_page(self, push_link, cacheable=True):
+        # Only pages of a range PushShift has finished ingesting are cached. Anything that can still change (new or
+        # late-ingested content, where the history starts) is always fetched.
+        cacheable = cacheable and self.cache is not None
+
+        if cacheable:
+            page = self.cache.get(push_link)
+            if page is not None:
+                return page
+
+        page = self.retry.call(self.client.get_json, push_link)["data"]
+
+        if cacheable:
+            self.cache.put(push_link, page)
+
+        return page
+
+    def oldest_created(self, after):
+        # One cheap request to find where the history actually starts, so that a first sync from 0 doesn't spend most
+        # of its windows on years before the account existed.
+        page = self.get_page(self.search_link("asc", max(0, after - 1), limit=1), cacheable=False)
+
+        return page[0]["created_utc"] if page else None
+
+    def split_range(self, after, before):
+        window_count = max(1, self.workers * self.windows_per_worker)
+        # Window sizes are rounded up to a power of two hours and the edges sit on multiples of the size, so as the end
+        # of the range creeps forward only the newest window and the oldest (clamped to after) change
+        window_hours = max(1, -(-(before - after) // (window_count * WINDOW_GRID)))
+        window_size = 2 ** (window_hours - 1).bit_length() * WINDOW_GRID
+
+        windows = []
+        window_before = -(-before // window_size) * window_size
+        while window_before > after:
+            window_after = max(after, window_before - window_size)
+            windows.append((window_after, min(before, window_before)))
+            window_before = window_after
+
+        return windows
+
+    def pages(self, window_after, window_before):
+        # Yields each page of [window_after, window_before) exactly once. The cursor is moved to one second past the
+        # last item of each page so that items sharing a timestamp across a page boundary aren't skipped; the repeats
+        # are dropped by ID, and a page with nothing new ends the window.
+        seen_ids = set()
+        cursor = window_before
+        cacheable = window_before <= time.time() - INGEST_LAG
+
+        while not self.stopped():
+            page = self.get_page(self.search_link("desc", max(0, window_after - 1), cursor), cacheable)
+            page = [record for record in page if record["id"] not in seen_ids]
+
+            if not page:
+                return
+
+            seen_ids.update(record["id"] for record in page)
+            yield page
+
+            cursor = page[-1]["created_utc"] + 1
+
+    def crawl_window(self, window_after, window_before):
+        return [record for page in self.pages(window_after, window_before) for record in page]
+
+    def crawl(self, after=0, before=None):
+        # Generator over every record in the range, newest first. With a single worker the pages are streamed straight
+        # through; otherwise each window is gathered by the pool and handed on as soon as all newer windows are done.
+        oldest = self.oldest_created(after)
+        if oldest is None:
+            return
+
+        if before is None:
+            before = -(-(int(time.time()) + 1) // WINDOW_GRID) * WINDOW_GRID
+
+        windows = self.split_range(max(after, oldest), before)
+        seen_ids = set()
+
+        if self.workers == 1:
+            for window_after, window_before in windows:
+                for page in self.pages(window_after, window_before):
+                    for record in page:
+                        if record["id"] not in seen_ids:
+                            seen_ids.add(record["id"])
+                            yield record
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.crawl_window, window_after, window_before)
+                       for window_after, window_before in windows]
+
+            try:
+                for future in futures:
+                    for record in future.result():
+                        if record["id"] not in seen_ids:
+                            seen_ids.add(record["id"])
+                            yield record
+            finally:
+                for future in futures:
+                    future.cancel()
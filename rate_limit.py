@@ -0,0 +1,72 @@
+import threading
+import time
+
+
+class TokenBucket:
+    # Request budget shared by every thread talking to the Reddit API. Tokens refill at the rate Reddit reports through
+    # its X-Ratelimit-Remaining / X-Ratelimit-Reset headers, so concurrent callers spread the remaining budget over the
+    # rest of the window instead of bursting into 429s. The defaults match Reddit's 600 requests per 10 minutes.
+    def __init__(self, rate=1.0, capacity=4):
+        self.rate = rate  # Tokens added per second
+        self.base_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, stopped=lambda: False):
+        # Blocks until a token is available. Returns False if the caller was stopped while waiting.
+        while not stopped():
+            with self.lock:
+                self.refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(min(wait, 0.5))
+
+        return False
+
+    def update(self, remaining, seconds_to_reset):
+        if remaining is None or seconds_to_reset is None:
+            return
+
+        with self.lock:
+            self.refill()
+
+            # With nothing left the bucket waits out the window, refilling a single token by the time it resets
+            self.rate = max(float(remaining), 1.0) / max(float(seconds_to_reset), 1.0)
+            self.tokens = min(self.tokens, float(remaining))
+
+    def update_from_headers(self, headers):
+        remaining = headers.get("X-Ratelimit-Remaining")
+        seconds_to_reset = headers.get("X-Ratelimit-Reset")
+
+        self.update(remaining, seconds_to_reset)
+
+    def update_from_reddit(self, reddit, window_size=600):
+        # PRAW parses the same headers after every request and keeps them on the authenticator
+        limits = reddit.auth.limits
+        reset_timestamp = limits.get("reset_timestamp")
+
+        if reset_timestamp is not None:
+            self.update(limits.get("remaining"), reset_timestamp - time.time())
+            return
+
+        # Newer versions no longer expose the reset time. Without it the rate never drops below the default, and an
+        # exhausted budget is left to prawcore's own limiter, which does wait for the reset Reddit reports.
+        remaining = limits.get("remaining")
+        if remaining is None:
+            return
+
+        with self.lock:
+            self.refill()
+            self.rate = max(self.base_rate, float(remaining) / window_size)
@@ -0,0 +1,179 @@
+from array import array
+import numpy
+
+INFO_FIELDS = ["score", "edited", "awarded", "removed"]
+BOOLEAN_FIELDS = ["edited", "awarded", "removed"]
+
+
+class RecordStore:
+    # Gathered posts or comments kept as parallel typed columns instead of one dict per item. Fields reddit.info may not
+    # have filled in carry a separate "known" mask rather than an "Unknown" string, and subreddit names are stored
+    # once and referenced by index. "selection" holds the rows that passed the filters, in display order.
+    def __init__(self, kind):
+        self.kind = kind
+        self.text_fields = ["title", "selftext"] if kind == "posts" else ["body"]
+
+        self.ids = []
+        self.rows = {}
+        self.text = {field: [] for field in self.text_fields}
+        self.permalinks = []
+        self.subreddit_names = []
+        self.subreddit_index = {}
+        self.subreddits = array("q")
+        self.created = array("q")
+        self.score = array("q")
+        self.flags = {field: bytearray() for field in BOOLEAN_FIELDS}
+        self.known_flags = {field: bytearray() for field in INFO_FIELDS}
+        self.selection = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, content_id):
+        return content_id in self.rows
+
+    def append(self, content_id, created, subreddit, permalink, texts, score=None, edited=None, awarded=None,
+               removed=None):
+        # Adds an item and returns its row. An ID that is already stored keeps its existing row.
+        if content_id in self.rows:
+            return self.rows[content_id]
+
+        row = len(self.ids)
+        self.ids.append(content_id)
+        self.rows[content_id] = row
+
+        for field in self.text_fields:
+            self.text[field].append(texts.get(field) or "")
+
+        subreddit = str(subreddit)
+        if subreddit not in self.subreddit_index:
+            self.subreddit_index[subreddit] = len(self.subreddit_names)
+            self.subreddit_names.append(subreddit)
+
+        self.subreddits.append(self.subreddit_index[subreddit])
+        self.permalinks.append(permalink)
+        self.created.append(int(created))
+        self.score.append(0)
+
+        for field in BOOLEAN_FIELDS:
+            self.flags[field].append(0)
+        for field in INFO_FIELDS:
+            self.known_flags[field].append(0)
+
+        self.set_info(row, score, edited, awarded, removed)
+
+        return row
+
+    def extend(self, ids, created, subreddits, permalinks, texts, info):
+        # Bulk version of append for whole columns: texts maps each text field to a list, and info maps score and the
+        # boolean fields to (values, known) numpy arrays. IDs that are already stored are skipped.
+        keep = []
+        for index, content_id in enumerate(ids):
+            if content_id not in self.rows:
+                self.rows[content_id] = len(self.ids)
+                self.ids.append(content_id)
+                keep.append(index)
+
+        if len(keep) != len(ids):
+            created = numpy.asarray(created)[keep]
+            subreddits = [subreddits[index] for index in keep]
+            permalinks = [permalinks[index] for index in keep]
+            texts = {field: [values[index] for index in keep] for field, values in texts.items()}
+            info = {field: (values[keep], known[keep]) for field, (values, known) in info.items()}
+
+        for field in self.text_fields:
+            self.text[field].extend(value or "" for value in texts[field])
+
+        for subreddit in subreddits:
+            if subreddit not in self.subreddit_index:
+                self.subreddit_index[subreddit] = len(self.subreddit_names)
+                self.subreddit_names.append(subreddit)
+
+        self.subreddits.extend(self.subreddit_index[subreddit] for subreddit in subreddits)
+        self.permalinks.extend(permalinks)
+        self.created.frombytes(numpy.asarray(created, dtype=numpy.int64).tobytes())
+
+        score, known_score = info["score"]
+        self.score.frombytes(numpy.where(known_score, score, 0).astype(numpy.int64).tobytes())
+        self.known_flags["score"].extend(numpy.asarray(known_score, dtype=numpy.uint8).tobytes())
+
+        for field in BOOLEAN_FIELDS:
+            values, known = info[field]
+            self.flags[field].extend((numpy.asarray(values, dtype=bool) & known).astype(numpy.uint8).tobytes())
+            self.known_flags[field].extend(numpy.asarray(known, dtype=numpy.uint8).tobytes())
+
+    def set_info(self, row, score=None, edited=None, awarded=None, removed=None):
+        for field, value in [("score", score), ("edited", edited), ("awarded", awarded), ("removed", removed)]:
+            if value is None:
+                continue
+
+            if field == "score":
+                self.score[row] = int(value)
+            else:
+                self.flags[field][row] = int(bool(value))
+
+            self.known_flags[field][row] = 1
+
+    def apply_fields(self, content_id, fields):
+        # Merges what reddit.info returned for an item. PushShift keeps the text from before it was removed, so the
+        # text is only replaced with Reddit's copy if the item is still there.
+        row = self.rows[content_id]
+        self.set_info(row, fields["score"], fields["edited"], fields["awarded"], fields["removed"])
+
+        if not fields["removed"]:
+            text_field = self.text_fields[-1]
+            self.text[text_field][row] = fields[text_field]
+
+    def value(self, field, row):
+        # Native value of a field, or None if it isn't known
+        if field in INFO_FIELDS and not self.known_flags[field][row]:
+            return None
+
+        if field == "score":
+            return self.score[row]
+        if field in BOOLEAN_FIELDS:
+            return bool(self.flags[field][row])
+        if field == "created":
+            return self.created[row]
+        if field == "subreddit":
+            return self.subreddit_names[self.subreddits[row]]
+        if field == "permalink":
+            return self.permalinks[row]
+        if field == "id":
+            return self.ids[row]
+
+        return self.text[field][row]
+
+    def record(self, row):
+        # The item as a dict, with "Unknown" in place of missing values the way the results view shows them
+        record = {field: self.text[field][row] for field in self.text_fields}
+        record["subreddit"] = self.subreddit_names[self.subreddits[row]]
+        record["permalink"] = self.permalinks[row]
+        record["created"] = self.created[row]
+
+        for field in INFO_FIELDS:
+            value = self.value(field, row)
+            record[field] = value if value is not None else "Unknown"
+
+        return record
+
+    def column(self, field):
+        # Copies rather than views, so the store can keep growing while the arrays are in use
+        if field == "created":
+            return numpy.frombuffer(self.created, dtype=numpy.int64).copy() if self.ids else numpy.zeros(0, numpy.int64)
+        if field == "score":
+            return numpy.frombuffer(self.score, dtype=numpy.int64).copy() if self.ids else numpy.zeros(0, numpy.int64)
+
+        return numpy.frombuffer(self.flags[field], dtype=bool).copy() if self.ids else numpy.zeros(0, bool)
+
+    def known(self, field):
+        if field == "created":
+            return numpy.ones(len(self.ids), dtype=bool)
+
+        return numpy.frombuffer(self.known_flags[field], dtype=bool).copy() if self.ids else numpy.zeros(0, bool)
+
+    def selected_rows(self):
+        if self.selection is None:
+            return numpy.arange(len(self.ids))
+
+        return self.selection
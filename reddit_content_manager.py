@@ -1,90 +1,147 @@
 import sys
-from collections import OrderedDict
 from PySide2.QtWidgets import *
 from PySide2.QtCore import *
 from PySide2.QtGui import *
 from mainwindow import UIMainWindow
 from profilewindow import UIProfileWindow
+from content_archive import ContentArchive
+from pushshift import PushShiftCrawler
+from response_cache import ResponseCache
+from enrichment import ContentEnricher, content_fields
+from filter_engine import compile_mask, sort_order, uses_reddit_state
+from record_store import RecordStore
+from progress import ProgressReporter
+from content_model import ContentModel
+from exporter import export_records, import_records
+from deletion import ContentDeleter
+from deletion_journal import new_journal, unfinished_journals
+from text_search import SEARCH_MODES, text_matcher
+from retry import RetryPolicy
+from profile_registry import ProfileRegistry
+from subscriptions import SubscriptionMigrator, missing_subscriptions, subscribed_names
 import os
 import praw
 import datetime
 import shutil
-import requests
-import json
-import textwrap
 import webbrowser
-import pandas
+import numpy
+import re
+import time
+
+OUTPUT_BATCH_SIZE = 500  # Records sent to the results pane per signal
+RESULT_INTERVAL = 0.1  # Seconds between batches of deletion results sent to the results pane
 
 log_file = f"logs/{datetime.datetime.now().strftime('%m%d%Y - %H%M%S')}.log"
 
 
 class ThreadDeleteContent(QThread):
-    remove_comment = Signal(int)
+    content_results = Signal(list)
     thread_progress = Signal(int)
     thread_status = Signal(str)
 
-    def __init__(self, parent, profile):
+    def __init__(self, parent, profile, targets=(), skipped=(), overwrite=True, journal=None):
+        # Works from a snapshot of (kind, ID) targets taken on the GUI thread, and never touches the view itself
         self.stopped = False
         self.parent = parent
         self.profile = profile
+        self.targets = tuple(targets)
+        self.skipped = tuple(skipped)
+        self.overwrite = overwrite
+        self.journal = journal
+        self.results = []
+        self.reported = 0.0
+        self.archive = None
+        self.removed = {"posts": [], "comments": []}
 
         super().__init__()
 
     def run(self):
+        # Every deletion is recorded in a journal as it happens, so a run that's stopped or cut short can be resumed
+        # with only the items that weren't deleted yet
+        journal = self.journal
+
+        try:
+            self.archive = ContentArchive()
+
+            if journal is None:
+                journal = new_journal(self.profile[0])
+                journal.start(self.profile[0], self.skipped + self.targets, self.overwrite)
+
+                for kind, content_id in self.skipped:
+                    journal.record(kind, content_id, "skipped")
+                    self.report(kind, content_id, "skipped")
+
+                targets = self.targets
+            else:
+                targets = journal.remaining()
+        except Exception as e:
+            log(e)
+            self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
+
+        content_already_deleted = len(journal.targets) - len(targets)
+        progress = ProgressReporter("Deleting content", len(journal.targets), self.thread_status.emit,
+                                    self.thread_progress.emit)
+        progress.update(content_already_deleted)
+
+        content_deleted = 0
+        content_failed = 0
+        deleter = ContentDeleter(lambda: reddit_login(self.profile), overwrite=journal.overwrite,
+                                 stopped=lambda: self.stopped,
+                                 retry=RetryPolicy(stopped=lambda: self.stopped, on_retry=log_retry))
+
         try:
-            reddit = praw.Reddit(username=self.profile[0],
-                                 password=self.profile[1],
-                                 client_id=self.profile[2],
-                                 client_secret=self.profile[3],
-                                 user_agent="Reddit Content Manager")
-            reddit.validate_on_submit = True
+            for kind, content_id, error in deleter.delete(targets):
+                if error is None:
+                    content_deleted += 1
+                    journal.record(kind, content_id, "deleted")
+                    self.removed[kind].append(content_id)
+                    self.report(kind, content_id, "deleted")
+                else:
+                    content_failed += 1
+                    journal.record(kind, content_id, "failed", error)
+                    log(f"Couldn't delete {content_id}: {error}")
 
+                progress.advance()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
+        finally:
+            journal.close()
+            self.report_results()
+            self.archive.close()
 
-        content_deleted = 0
-        content_already_deleted = 0
-        total_to_delete = len(self.parent.ui.content_tree.selectedItems())
-        for index, item in enumerate(reversed(self.parent.ui.content_tree.selectedItems())):
-            if self.stopped:
-                self.thread_status.emit("Process stopped by user...")
-                return
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
 
-            if item.statusTip(0) == "Reddit Content":
-                if self.parent.current_search == "comments":
-                    try:
-                        reddit.comment(item.text(0)).edit("[removed]")
-                        reddit.comment(item.text(0)).delete()
-                        content_deleted += 1
-                        item.setSelected(False)
-                        item.setTextColor(0, QColor(255, 0, 0))
-                    except Exception as e:
-                        log(e)
-                else:
-                    try:
-                        try:
-                            reddit.submission(item.text(0)).edit("[removed]")
-                            # Tries to edit the text, if it can't (because it isn't a text post), then it just catches
-                            # the exception and passes it.
-                        except:
-                            pass
-                        reddit.submission(item.text(0)).delete()
-                        content_deleted += 1
-                        item.setSelected(False)
-                        item.setTextColor(0, QColor(255, 0, 0))
-                    except Exception as e:
-                        log(e)
-            else:
-                content_already_deleted += 1
-                item.setSelected(False)
+        journal.finish()
+
+        log(f"Done deleting content! ({progress.rate():.1f} items/s)")
+        self.thread_status.emit(f"Done! {content_deleted} removed. | {content_already_deleted} already removed. | "
+                                f"{content_failed} failed.")
 
-            self.thread_status.emit(f"Deleting content ({index}/{total_to_delete})")
-            self.thread_progress.emit((index / total_to_delete) * 100)
+    def report(self, kind, content_id, outcome):
+        # Outcomes go back to the view in batches, at most one signal per RESULT_INTERVAL
+        self.results.append((kind, content_id, outcome))
 
-        self.thread_status.emit(f"Done! {content_deleted} removed. | {content_already_deleted} already removed.")
+        if time.monotonic() - self.reported >= RESULT_INTERVAL:
+            self.report_results()
+
+    def report_results(self):
+        if self.results:
+            self.content_results.emit(self.results)
+            self.results = []
+
+        # Deleted content is flagged in the archive in the same batches, so the next search doesn't bring it back
+        for kind, content_ids in self.removed.items():
+            if content_ids:
+                self.archive.mark_removed(self.profile[0], kind, content_ids)
+                content_ids.clear()
+
+        self.reported = time.monotonic()
 
     def stop_thread(self):
         self.stopped = True
@@ -95,13 +152,22 @@ class ThreadGatherPosts(QThread):
     thread_progress = Signal(int)
     thread_status = Signal(str)
 
-    def __init__(self, parent, profile, search_text, filters):
+    def __init__(self, parent, profile, search_text, filters, stream=False, refresh=True):
         try:
             self.stopped = False
             self.parent = parent
             self.profile = profile
-            self.search_text = search_text
+            # Regex and fuzzy searches scan the gathered text themselves, so the archive only applies the filters
+            self.matcher = text_matcher(search_text, filters)
+            self.search_text = search_text if self.matcher is None else ""
             self.filters = filters
+            self.stream = stream
+            # Archived matches are only refreshed when a filter or the sort looks at their score or status
+            self.refresh = refresh and uses_reddit_state(filters)
+            self.streamed = set()
+            self.scanned = set()
+            self.first_crawled = 0
+            self.unmatched = numpy.zeros(0, dtype=numpy.int64)
 
             super().__init__()
 
@@ -111,10 +177,20 @@ class ThreadGatherPosts(QThread):
 
     def run(self):
         posts = self.get_post_info()
+        if posts is None:
+            return
+
         posts = self.filter_posts(posts)
+        if posts is None:
+            return
+
+        posts = self.sort_posts(posts)
+        if posts is None:
+            return
+
         self.output_posts(posts)
 
-        num_found = len([post for post in posts.keys() if posts[post]["drop"] is not True])
+        num_found = len(posts.selected_rows())
         self.thread_status.emit(f"Process finished! {num_found} posts found!")
         self.parent.current_profile = self.parent.ui.profile_list.selectedItems()[0].text()
         log("Thread execution finished successfully!")
@@ -123,160 +199,175 @@ class ThreadGatherPosts(QThread):
         log("Getting posts...")
         self.thread_status.emit("Getting posts...")
 
-        push_link = f"https://api.pushshift.io/reddit/search/submission/?q={self.search_text}" \
-                    f"&sort_type=created_utc" \
-                    f"&author={self.profile[0]}" \
-                    f"&{['after', 'before'][self.filters['Time'][0]]}={self.filters['Time'][1]}" \
-                    f"&limit=1000"
-
         try:
-            posts = json.loads(requests.get(push_link).content)
+            archive = ContentArchive()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
 
-        if not posts["data"]:
-            self.thread_status.emit("No results found...")
-            raise Exception("No results found...")
+        try:
+            return self.gather_posts(archive)
+        finally:
+            archive.close()
 
-        while len(json.loads(requests.get(push_link).content)["data"]) != 0:
-            if self.stopped:
-                self.thread_status.emit("Process stopped by user...")
-                return
+    def gather_posts(self, archive):
+        try:
+            crawl_after = archive.crawl_after("posts", self.profile[0])
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
 
+        # Only content created since the last completed sync (less a few days of overlap) is crawled, the rest is served
+        # from the archive.
+        # Each post is queued for enrichment as soon as its page arrives, so reddit.info runs alongside the crawl.
+        posts = RecordStore("posts")
+
+        if self.stream or self.refresh:
+            # Archived matches are shown as soon as they're current, and new posts join them as their enrichment
+            # completes
             try:
-                push_link = f"https://api.pushshift.io/reddit/search/submission/?q={self.search_text}" \
-                            f"&sort_type=created_utc" \
-                            f"&author={self.profile[0]}" \
-                            f"&{['after', 'before'][self.filters['Time'][0]]}={posts['data'][-1]['created_utc']}" \
-                            f"&subreddit={self.filters['Subreddit']}" \
-                            f"&limit=1000"
-
-                posts["data"] = posts["data"] + json.loads(requests.get(push_link).content)["data"]
+                posts = archive.load("posts", self.profile[0], self.search_text, self.filters)
             except Exception as e:
                 if not self.stopped:
                     log(e)
                     self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
                 return
 
+        self.first_crawled = len(posts)
+
+        # Archived matches are looked up through reddit.info again, so the filters see their current score, edited and
+        # removed state. Removed content can't change any more and is used as archived, as is everything when
+        # refreshing is turned off.
+        stale = [row for row in range(len(posts)) if self.refresh and not posts.value("removed", row)]
+        self.stream_posts(archive, posts, numpy.setdiff1d(numpy.arange(len(posts)), stale), loaded=True)
+
+        # Failed pages and reddit.info batches are retried on their own instead of ending the whole search
+        retry = RetryPolicy(stopped=lambda: self.stopped, on_retry=log_retry)
+        progress = ProgressReporter("Getting posts", 0, self.thread_status.emit, self.thread_progress.emit)
+        enricher = ContentEnricher(lambda: reddit_login(self.profile), "posts", stopped=lambda: self.stopped,
+                                   on_batch=progress.update, retry=retry)
+
         try:
-            reddit = praw.Reddit(username=self.profile[0],
-                                 password=self.profile[1],
-                                 client_id=self.profile[2],
-                                 client_secret=self.profile[3],
-                                 user_agent="Reddit Content Manager")
+            enricher.start()
+            for row in stale:
+                enricher.put(posts.ids[row])
+
+            crawler = PushShiftCrawler("submission", self.profile[0], stopped=lambda: self.stopped,
+                                       cache=ResponseCache(), retry=retry)
+
+            for post in crawler.crawl(after=crawl_after):
+                if post["id"] in posts:
+                    continue  # An archived match from the re-crawled overlap
+
+                posts.append(post["id"], post["created_utc"], post["subreddit"], post["permalink"],
+                             {"title": post["title"], "selftext": post["selftext"]})
+                enricher.put(post["id"])
+                self.stream_enriched_posts(archive, posts, enricher.drain())
+
+            enricher.close()
+            while self.stream and not enricher.done() and not self.stopped:
+                self.stream_enriched_posts(archive, posts, enricher.drain(timeout=0.1))
+
+            post_info = enricher.finish()
+            progress.finish()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
+        finally:
+            enricher.shutdown()
 
-        posts_by_id = OrderedDict({post["id"]: {"selftext": post["selftext"],
-                                                "title": post["title"],
-                                                "subreddit": post["subreddit"],
-                                                "permalink": post["permalink"],
-                                                "created": post["created_utc"],
-                                                "score": "Unknown",
-                                                "edited": "Unknown",
-                                                "awarded": "Unknown",
-                                                "removed": "Unknown",
-                                                "processed": False,  # used to determine if the content was processed
-                                                "drop": False  # used to determine if content matches filters or not
-                                                } for post in posts["data"]})
-        post_ids = list(posts_by_id.keys())
-
-        log("Getting post info...")
-        self.thread_status.emit(f"Getting post info... (0/{len(post_ids)})")
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
 
-        try:
-            if len(post_ids) >= 100:
-                for iteration in range(100, len(post_ids), 100):
-                    if self.stopped:
-                        self.thread_status.emit("Process stopped by user...")
-                        return
-
-                    current_posts = ["t3_" + post_id for post_id in post_ids[iteration - 100:iteration]]
-                    current_post_info = [post_info for post_info in reddit.info(current_posts)]
-                    post_score_info = {post.id: post.score for post in current_post_info}
-                    post_awarded_info = {post_info.id: post_info.distinguished is not None for post_info in
-                                         current_post_info}
-                    post_edited_info = {post_info.id: post_info.edited is not False for post_info in
-                                        current_post_info}
-                    post_removed_info = {post_info.id: post_info.selftext in ["[removed]", "[deleted]"] for
-                                         post_info in current_post_info}
-                    post_selftext_info = {post_info.id: post_info.selftext for post_info in current_post_info}
-
-                    for post_id in post_ids[iteration - 100:iteration]:
-                        if post_id in post_score_info.keys():
-                            posts_by_id[post_id]["score"] = post_score_info[post_id]
-                        if post_id in post_awarded_info.keys():
-                            posts_by_id[post_id]["awarded"] = post_awarded_info[post_id]
-                        if post_id in post_edited_info.keys():
-                            posts_by_id[post_id]["edited"] = post_edited_info[post_id]
-                        if post_id in post_removed_info.keys():
-                            posts_by_id[post_id]["removed"] = post_removed_info[post_id]
-                        if post_id in post_selftext_info.keys():
-                            if post_selftext_info[post_id] not in ["[removed]", "[deleted]"]:
-                                posts_by_id[post_id]["selftext"] = post_selftext_info[post_id]
-
-                        posts_by_id[post_id]["processed"] = True
-
-                    num_complete = len([post_id for post_id in post_ids
-                                        if posts_by_id[post_id]["processed"] is True])
-
-                    self.thread_status.emit(f"Getting post info... ({num_complete}/{len(post_ids)})")
-                    self.thread_progress.emit((num_complete / len(post_ids) * 100))
-
-            if self.stopped:
-                self.thread_status.emit("Process stopped by user...")
-                return
+        stats = crawler.client.stats()
+        log(f"Done getting posts! ({stats['requests']} PushShift requests so far, "
+            f"{stats['bytes_received'] / 1e6:.1f} MB received, {crawler.cache.hits} cache hits, "
+            f"{crawler.cache.misses} cache misses)")
 
-            # Code below exists to process remainders or content that falls below the 100 item limit for .info
-            current_posts = ["t3_" + post_id for post_id in post_ids
-                             if posts_by_id[post_id]["processed"] is False]
-            current_post_info = [post_info for post_info in reddit.info(current_posts)]
-            post_score_info = {post_info.id: post_info.score for post_info in current_post_info}
-            post_awarded_info = {post_info.id: post_info.distinguished for post_info in
-                                 current_post_info}
-            post_edited_info = {post_info.id: post_info.edited is not False for post_info in
-                                current_post_info}
-            post_removed_info = {post_info.id: post_info.selftext in ["[removed]", "[deleted]"] for
-                                 post_info in current_post_info}
-            post_selftext_info = {post_info.id: post_info.selftext for post_info in current_post_info}
-
-            for post_id in current_posts:
-                post_id = post_id.replace("t3_", "")
-
-                if post_id in post_score_info.keys():
-                    posts_by_id[post_id]["score"] = post_score_info[post_id]
-                if post_id in post_awarded_info.keys():
-                    posts_by_id[post_id]["awarded"] = post_awarded_info[post_id]
-                if post_id in post_edited_info.keys():
-                    posts_by_id[post_id]["edited"] = post_edited_info[post_id]
-                if post_id in post_removed_info.keys():
-                    posts_by_id[post_id]["removed"] = post_removed_info[post_id]
-                if post_id in post_selftext_info.keys():
-                    if post_selftext_info[post_id] not in ["[removed]", "[deleted]"]:
-                        posts_by_id[post_id]["body"] = post_selftext_info[post_id]
-
-                posts_by_id[post_id]["processed"] = True
-
-            num_complete = len([post_id for post_id in post_ids
-                                if posts_by_id[post_id]["processed"] is True])
-
-            self.thread_status.emit(f"Getting post info... ({num_complete}/{len(post_ids)})")
-            self.thread_progress.emit((num_complete / len(post_ids) * 100))
-
-            log("Done getting post info!")
+        for post_id, fields in post_info.items():
+            if post_id in posts:
+                posts.apply_fields(post_id, fields)
+
+        log("Done getting post info!")
+
+        try:
+            # Newly crawled posts are archived along with the archived ones that were refreshed
+            crawled = range(self.first_crawled, len(posts))
+            refreshed = [posts.rows[post_id] for post_id in post_info if posts.rows[post_id] < self.first_crawled]
+            archive.store(self.profile[0], posts, refreshed + list(crawled))
+
+            if len(crawled):
+                archive.set_high_water("posts", self.profile[0], max(posts.created[self.first_crawled:]))
+
+            if self.stream:
+                # Streamed searches keep the new and refreshed posts in the same store as the archived matches, so
+                # they're matched here instead of reloaded
+                checked = numpy.array(refreshed + list(crawled), dtype=numpy.int64)
+                matched = archive.matching_rows(self.profile[0], posts, checked, self.search_text, self.filters)
+                self.unmatched = numpy.setdiff1d(checked, matched)
+            else:
+                posts = archive.load("posts", self.profile[0], self.search_text, self.filters)
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
 
-        return posts_by_id
+        if not len(posts):
+            self.thread_status.emit("No results found...")
+            return
+
+        return posts
+
+    def stream_posts(self, archive, posts, rows, loaded=False):
+        # Sends the rows that pass the search to the results pane ahead of the output stage. Rows just loaded from the
+        # archive already had the search applied; newly crawled and refreshed ones are matched against their freshly
+        # archived copies, since a refresh can change the text.
+        if not self.stream:
+            return
+
+        rows = numpy.array([row for row in rows.tolist() if row not in self.streamed and row not in self.scanned],
+                           dtype=numpy.int64)
+        rows = rows[compile_mask(posts, self.filters, rows)]
+
+        if not loaded:
+            rows = archive.matching_rows(self.profile[0], posts, rows, self.search_text, self.filters)
+
+        if self.matcher is None:
+            self.output_streamed_posts(posts, rows.tolist())
+            return
+
+        # Regex and fuzzy matches are shown a chunk at a time as the scan gets through them
+        self.scanned.update(rows.tolist())
+        for matched in self.matcher.matches(posts, rows, stopped=lambda: self.stopped):
+            self.output_streamed_posts(posts, matched.tolist())
+
+    def output_streamed_posts(self, posts, rows):
+        if rows:
+            self.streamed.update(rows)
+            self.output_post.emit({"index": len(self.streamed), "records": posts, "rows": rows})
+
+    def stream_enriched_posts(self, archive, posts, batches):
+        if not self.stream or not batches:
+            return
+
+        rows = []
+        for post_info in batches:
+            for post_id, fields in post_info.items():
+                if post_id in posts:
+                    posts.apply_fields(post_id, fields)
+                    rows.append(posts.rows[post_id])
+
+        # The full-text index is kept up to date as content is gathered
+        archive.store(self.profile[0], posts, rows)
+        self.stream_posts(archive, posts, numpy.array(rows, dtype=numpy.int64))
 
     def filter_posts(self, posts):
         if self.stopped:
@@ -285,58 +376,16 @@ class ThreadGatherPosts(QThread):
 
         try:
             log("Filtering posts...")
-            self.thread_status.emit(f"Filtering posts... (0/{len(posts)})")
-
-            for index, post_id in enumerate(posts):
-                score = posts[post_id]["score"]
-                awarded = posts[post_id]["awarded"]
-                edited = posts[post_id]["edited"]
-                removed = posts[post_id]["removed"]
-
-                if score != "Unknown":
-                    if score < self.filters["Score"][0] or score > self.filters["Score"][1]:
-                        posts[post_id]["drop"] = True
-
-                if awarded != "Unknown":
-                    if self.filters["Awarded"] != 0:
-                        if self.filters["Awarded"] == 1:
-                            posts[post_id]["drop"] = not awarded
-                        else:
-                            posts[post_id]["drop"] = bool(awarded)
-                else:
-                    if self.filters["Awarded"] != 0:
-                        posts[post_id]["drop"] = True
-
-                if edited != "Unknown":
-                    if self.filters["Edited"] != 0:
-                        if self.filters["Edited"] == 1:
-                            posts[post_id]["drop"] = True if edited is False else False
-                        else:
-                            posts[post_id]["drop"] = True if edited is not False else False
-                else:
-                    if self.filters["Edited"] != 0:
-                        posts[post_id]["drop"] = True
-
-                if removed != "Unknown":
-                    if self.filters["Removed"] != 0:
-                        if self.filters["Removed"] == 1:
-                            posts[post_id]["drop"] = True if removed is False else False
-                        else:
-                            posts[post_id]["drop"] = True if removed is not False else False
-
-                self.thread_status.emit(f"Filtering posts... ({index}/{len(posts) - 1})")
-                self.thread_progress.emit((index / len(posts) * 100))
-
-            if self.filters["Sort"] == 0:
-                posts = OrderedDict((sorted((kv for kv in posts.items()), key=lambda kv: kv[1]['created'],
-                                            reverse=True)))
-            else:
-                posts_score_unknown = OrderedDict(kv for kv in posts.items() if kv[1]['score'] == "Unknown")
-                posts = OrderedDict(kv for kv in posts.items() if kv[1]['score'] != "Unknown")
-                posts = OrderedDict((sorted((kv for kv in posts.items()), key=lambda kv: kv[1]['score'],
-                                            reverse=True)))
-                posts = OrderedDict([kv for kv in posts.items()] + [kv for kv in posts_score_unknown.items()])
+            self.thread_status.emit(f"Filtering posts... ({len(posts)} posts)")
+
+            mask = compile_mask(posts, self.filters)
+            mask[self.unmatched] = False
 
+            posts.selection = numpy.flatnonzero(mask)
+            if self.matcher is not None:
+                posts.selection = self.match_posts(posts, posts.selection)
+
+            self.thread_progress.emit(100)
             log("Done filtering posts!")
         except Exception as e:
             if not self.stopped:
@@ -346,28 +395,63 @@ class ThreadGatherPosts(QThread):
 
         return posts
 
+    def match_posts(self, posts, rows):
+        # Scans the text of the rows that pass the filters. Rows already scanned while streaming are kept if they
+        # were shown and dropped if they weren't.
+        log(f"Scanning post text ({self.filters['Search Mode']})...")
+        self.thread_status.emit(f"Scanning posts... ({len(rows)} posts)")
+
+        scanned = numpy.isin(rows, numpy.fromiter(self.scanned, dtype=numpy.int64))
+        streamed = rows[scanned & numpy.isin(rows, numpy.fromiter(self.streamed, dtype=numpy.int64))]
+        matched = self.matcher.matching_rows(posts, rows[~scanned], stopped=lambda: self.stopped)
+
+        log(f"Done scanning post text! ({len(streamed) + len(matched)} matches)")
+        return numpy.sort(numpy.concatenate([streamed, matched]))
+
+    def sort_posts(self, posts):
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
+
+        try:
+            log("Sorting posts...")
+
+            posts.selection = sort_order(posts, posts.selected_rows(), self.filters["Sort"])
+
+            log("Done sorting posts!")
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
+
+        return posts
+
     def output_posts(self, posts):
         if self.stopped:
             self.thread_status.emit("Process stopped by user...")
             return
 
         log("Outputting posts...")
-        self.thread_status.emit(f"Outputting comments... (0/{len(posts)})")
+        rows = posts.selected_rows()
+        if self.streamed:
+            rows = rows[~numpy.isin(rows, numpy.fromiter(self.streamed, dtype=numpy.int64))]
+
+        progress = ProgressReporter("Outputting posts", len(rows), self.thread_status.emit, self.thread_progress.emit)
+        progress.flush()
 
         try:
-            for index, post_id in enumerate(posts):
+            for start in range(0, len(rows), OUTPUT_BATCH_SIZE):
                 if self.stopped:
                     self.thread_status.emit("Process stopped by user...")
                     return
 
-                if posts[post_id]["drop"] is False:
-                    self.output_post.emit({"index": index, "id": post_id,
-                                           "data": posts[post_id], "num_comments": len(posts)})
+                batch = rows[start:start + OUTPUT_BATCH_SIZE].tolist()
+                self.output_post.emit({"index": start, "records": posts, "rows": batch})
+                progress.update(start + len(batch))
 
-                self.thread_status.emit(f"Outputting posts... ({index}/{len(posts) - 1})")
-                self.thread_progress.emit(index / len(posts) * 100)
-
-            log("Done outputting posts!")
+            progress.finish()
+            log(f"Done outputting posts! ({progress.rate():.0f} posts/s)")
         except Exception as e:
             if not self.stopped:
                 log(e)
@@ -383,13 +467,22 @@ class ThreadGatherComments(QThread):
     thread_progress = Signal(int)
     thread_status = Signal(str)
 
-    def __init__(self, parent, profile, search_text, filters):
+    def __init__(self, parent, profile, search_text, filters, stream=False, refresh=True):
         try:
             self.stopped = False
             self.parent = parent
             self.profile = profile
-            self.search_text = search_text
+            # Regex and fuzzy searches scan the gathered text themselves, so the archive only applies the filters
+            self.matcher = text_matcher(search_text, filters)
+            self.search_text = search_text if self.matcher is None else ""
             self.filters = filters
+            self.stream = stream
+            # Archived matches are only refreshed when a filter or the sort looks at their score or status
+            self.refresh = refresh and uses_reddit_state(filters)
+            self.streamed = set()
+            self.scanned = set()
+            self.first_crawled = 0
+            self.unmatched = numpy.zeros(0, dtype=numpy.int64)
 
             super().__init__()
 
@@ -399,13 +492,23 @@ class ThreadGatherComments(QThread):
 
     def run(self):
         comments = self.get_comment_info()
+        if comments is None:
+            return
+
         comments = self.filter_comments(comments)
+        if comments is None:
+            return
+
+        comments = self.sort_comments(comments)
+        if comments is None:
+            return
+
         self.output_comments(comments)
 
         if self.stopped:
             return
 
-        num_found = len([comment for comment in comments.keys() if comments[comment]["drop"] is not True])
+        num_found = len(comments.selected_rows())
         self.thread_status.emit(f"Process finished! {num_found} comments found!")
         self.parent.current_profile = self.parent.ui.profile_list.selectedItems()[0].text()
         log("Thread execution finished successfully!")
@@ -414,174 +517,192 @@ class ThreadGatherComments(QThread):
         log("Getting comments...")
         self.thread_status.emit("Getting comments...")
 
-        push_link = f"https://api.pushshift.io/reddit/search/comment/?q={self.search_text}" \
-                    f"&sort_type=created_utc" \
-                    f"&author={self.profile[0]}" \
-                    f"&{['after', 'before'][self.filters['Time'][0]]}={self.filters['Time'][1]}" \
-                    f"&limit=1000"
-
         try:
-            comments = json.loads(requests.get(push_link).content)
+            archive = ContentArchive()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
 
-        if not comments["data"]:
-            self.thread_status.emit("No results found...")
-            raise Exception("No results found...")
+        try:
+            return self.gather_comments(archive)
+        finally:
+            archive.close()
 
-        while 1:
-            if self.stopped:
-                self.thread_status.emit("Process stopped by user...")
-                return
+    def gather_comments(self, archive):
+        try:
+            crawl_after = archive.crawl_after("comments", self.profile[0])
+            known_ids = archive.known_ids("comments", self.profile[0])
 
-            try:
-                push_link = f"https://api.pushshift.io/reddit/search/comment/?q={self.search_text}" \
-                            f"&sort_type=created_utc" \
-                            f"&author={self.profile[0]}" \
-                            f"&{['after', 'before'][self.filters['Time'][0]]}={comments['data'][-1]['created_utc']}" \
-                            f"&subreddit={self.filters['Subreddit']}" \
-                            f"&limit=1000"
+            reddit = reddit_login(self.profile)
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
 
-                comments["data"] = comments["data"] + json.loads(requests.get(push_link).content)["data"]
+        # Only content created since the last completed sync (less a few days of overlap) is crawled, the rest is served
+        # from the archive.
+        # Each comment is queued for enrichment as soon as its page arrives, so reddit.info runs alongside the crawl.
+        comments = RecordStore("comments")
 
-                if len(json.loads(requests.get(push_link).content)["data"]) == 0:
-                    break
+        if self.stream or self.refresh:
+            # Archived matches are shown as soon as they're current, and new comments join them as their enrichment
+            # completes
+            try:
+                comments = archive.load("comments", self.profile[0], self.search_text, self.filters)
             except Exception as e:
                 if not self.stopped:
                     log(e)
                     self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
                 return
 
+        self.first_crawled = len(comments)
+
+        # Archived matches are looked up through reddit.info again, so the filters see their current score, edited and
+        # removed state. Removed content can't change any more and is used as archived, as is everything when
+        # refreshing is turned off.
+        stale = [row for row in range(len(comments)) if self.refresh and not comments.value("removed", row)]
+        self.stream_comments(archive, comments, numpy.setdiff1d(numpy.arange(len(comments)), stale), loaded=True)
+
+        # Failed pages and reddit.info batches are retried on their own instead of ending the whole search
+        retry = RetryPolicy(stopped=lambda: self.stopped, on_retry=log_retry)
+        progress = ProgressReporter("Getting comments", 0, self.thread_status.emit, self.thread_progress.emit)
+        enricher = ContentEnricher(lambda: reddit_login(self.profile), "comments", stopped=lambda: self.stopped,
+                                   on_batch=progress.update, retry=retry)
+
         try:
-            reddit = praw.Reddit(username=self.profile[0],
-                                 password=self.profile[1],
-                                 client_id=self.profile[2],
-                                 client_secret=self.profile[3],
-                                 user_agent="Reddit Content Manager")
+            enricher.start()
+            for row in stale:
+                enricher.put(comments.ids[row])
+
+            crawler = PushShiftCrawler("comment", self.profile[0], stopped=lambda: self.stopped,
+                                       cache=ResponseCache(), retry=retry)
+
+            for comment in crawler.crawl(after=crawl_after):
+                if comment["id"] in comments:
+                    continue  # An archived match from the re-crawled overlap
+
+                comments.append(comment["id"], comment["created_utc"], comment["subreddit"], comment["permalink"],
+                                {"body": comment["body"]})
+                enricher.put(comment["id"])
+                self.stream_enriched_comments(archive, comments, enricher.drain())
+
+            enricher.close()
+            while self.stream and not enricher.done() and not self.stopped:
+                self.stream_enriched_comments(archive, comments, enricher.drain(timeout=0.1))
+
+            comment_info = enricher.finish()
+            progress.finish()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
+        finally:
+            enricher.shutdown()
 
-        comments_by_id = OrderedDict({comment["id"]: {"body": comment["body"],
-                                                      "subreddit": comment["subreddit"],
-                                                      "permalink": comment["permalink"],
-                                                      "created": comment["created_utc"],
-                                                      "score": "Unknown",
-                                                      "edited": "Unknown",
-                                                      "awarded": "Unknown",
-                                                      "removed": "Unknown",
-                                                      "processed": False,
-                                                      "drop": False
-                                                      } for comment in comments["data"]})
-
-        for comment in reddit.redditor(self.profile[0]).comments.new(limit=None):
-            if comment.id not in comments_by_id.keys():
-                comments_by_id[comment.id] = {"body": comment.body,
-                                              "subreddit": comment.subreddit,
-                                              "permalink": comment.permalink,
-                                              "created": comment.created_utc,
-                                              "score": "Unknown",
-                                              "edited": "Unknown",
-                                              "awarded": "Unknown",
-                                              "removed": "Unknown",
-                                              "processed": False,
-                                              "drop": False}
-
-        comment_ids = list(comments_by_id.keys())
-
-        log("Getting comment info...")
-        self.thread_status.emit(f"Getting comment info... (0/{len(comment_ids)})")
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
+
+        stats = crawler.client.stats()
+        log(f"Done getting comments! ({stats['requests']} PushShift requests so far, "
+            f"{stats['bytes_received'] / 1e6:.1f} MB received, {crawler.cache.hits} cache hits, "
+            f"{crawler.cache.misses} cache misses)")
+
+        new_high_water = max(comments.created[self.first_crawled:], default=0)
 
         try:
-            if len(comment_ids) >= 100:
-                for iteration in range(100, len(comment_ids), 100):
-                    if self.stopped:
-                        self.thread_status.emit("Process stopped by user...")
-                        return
-
-                    current_comments = ["t1_" + comment_id for comment_id in comment_ids[iteration - 100:iteration]]
-                    current_comment_info = [comment_info for comment_info in reddit.info(current_comments)]
-
-                    comment_score_info = {comment.id: comment.score for comment in current_comment_info}
-                    comment_awarded_info = {comment_info.id: comment_info.distinguished is not None for comment_info in
-                                            current_comment_info}
-                    comment_edited_info = {comment_info.id: comment_info.edited is not False for comment_info in
-                                           current_comment_info}
-                    comment_removed_info = {comment_info.id: comment_info.body in ["[removed]", "[deleted]"] for
-                                            comment_info in current_comment_info}
-                    comment_body_info = {comment_info.id: comment_info.body for comment_info in current_comment_info}
-
-                    for comment_id in comment_ids[iteration - 100:iteration]:
-                        if comment_id in comment_score_info.keys():
-                            comments_by_id[comment_id]["score"] = comment_score_info[comment_id]
-                        if comment_id in comment_awarded_info.keys():
-                            comments_by_id[comment_id]["awarded"] = comment_awarded_info[comment_id]
-                        if comment_id in comment_edited_info.keys():
-                            comments_by_id[comment_id]["edited"] = comment_edited_info[comment_id]
-                        if comment_id in comment_removed_info.keys():
-                            comments_by_id[comment_id]["removed"] = comment_removed_info[comment_id]
-                        if comment_id in comment_body_info.keys():
-                            if comment_body_info[comment_id] not in ["[removed]", "[deleted]"]:
-                                comments_by_id[comment_id]["body"] = comment_body_info[comment_id]
-
-                        comments_by_id[comment_id]["processed"] = True
-
-                    num_complete = len([comment_id for comment_id in comment_ids
-                                        if comments_by_id[comment_id]["processed"] is True])
-                    self.thread_status.emit(f"Getting comment info... ({num_complete}/{len(comment_ids)})")
-                    self.thread_progress.emit((num_complete / len(comment_ids) * 100))
-
-            if self.stopped:
-                self.thread_status.emit("Process stopped by user...")
-                return
+            # PushShift can lag behind Reddit, so the newest comments are also read from the profile itself. The listing
+            # already carries everything reddit.info would return, so these don't need to be enriched separately.
+            for comment in reddit.redditor(self.profile[0]).comments.new(limit=None):
+                if comment.id not in comments and comment.id not in known_ids:
+                    comments.append(comment.id, comment.created_utc, comment.subreddit, comment.permalink,
+                                    {"body": comment.body})
+                    comment_info[comment.id] = content_fields(comment, "body")
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
 
-            current_comments = ["t1_" + comment_id for comment_id in comment_ids
-                                if comments_by_id[comment_id]["processed"] is False]
-            current_comment_info = [comment_info for comment_info in reddit.info(current_comments)]
-            comment_score_info = {comment.id: comment.score for comment in current_comment_info}
-            comment_awarded_info = {comment_info.id: comment_info.distinguished for comment_info in
-                                    current_comment_info}
-            comment_edited_info = {comment_info.id: comment_info.edited is not False for comment_info in
-                                   current_comment_info}
-            comment_removed_info = {comment_info.id: comment_info.body in ["[removed]", "[deleted]"] for
-                                    comment_info in current_comment_info}
-            comment_body_info = {comment_info.id: comment_info.body for comment_info in current_comment_info}
-
-            for comment_id in current_comments:
-                comment_id = comment_id.replace("t1_", "")
-
-                if comment_id in comment_score_info.keys():
-                    comments_by_id[comment_id]["score"] = comment_score_info[comment_id]
-                if comment_id in comment_awarded_info.keys():
-                    comments_by_id[comment_id]["awarded"] = comment_awarded_info[comment_id]
-                if comment_id in comment_edited_info.keys():
-                    comments_by_id[comment_id]["edited"] = comment_edited_info[comment_id]
-                if comment_id in comment_removed_info.keys():
-                    comments_by_id[comment_id]["removed"] = comment_removed_info[comment_id]
-                if comment_id in comment_body_info.keys():
-                    if comment_body_info[comment_id] not in ["[removed]", "[deleted]"]:
-                        comments_by_id[comment_id]["body"] = comment_body_info[comment_id]
-
-                comments_by_id[comment_id]["processed"] = True
-
-            num_complete = len([comment_id for comment_id in comment_ids
-                                if comments_by_id[comment_id]["processed"] is True])
-            self.thread_status.emit(f"Getting comment info... ({num_complete}/{len(comment_ids)})")
-            self.thread_progress.emit((num_complete / len(comment_ids) * 100))
-
-            log("Done getting comment info!")
+        for comment_id, fields in comment_info.items():
+            if comment_id in comments:
+                comments.apply_fields(comment_id, fields)
+
+        log("Done getting comment info!")
+
+        try:
+            # Newly crawled comments are archived along with the archived ones that were refreshed
+            refreshed = [comments.rows[comment_id] for comment_id in comment_info
+                         if comments.rows[comment_id] < self.first_crawled]
+            archive.store(self.profile[0], comments, refreshed + list(range(self.first_crawled, len(comments))))
+            archive.set_high_water("comments", self.profile[0], new_high_water)
+
+            if self.stream:
+                # Streamed searches keep the new and refreshed comments in the same store as the archived matches, so
+                # they're matched here instead of reloaded
+                checked = numpy.array(refreshed + list(range(self.first_crawled, len(comments))), dtype=numpy.int64)
+                matched = archive.matching_rows(self.profile[0], comments, checked, self.search_text, self.filters)
+                self.unmatched = numpy.setdiff1d(checked, matched)
+            else:
+                comments = archive.load("comments", self.profile[0], self.search_text, self.filters)
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
 
-        return comments_by_id
+        if not len(comments):
+            self.thread_status.emit("No results found...")
+            return
+
+        return comments
+
+    def stream_comments(self, archive, comments, rows, loaded=False):
+        # Sends the rows that pass the search to the results pane ahead of the output stage. Rows just loaded from the
+        # archive already had the search applied; newly crawled and refreshed ones are matched against their freshly
+        # archived copies, since a refresh can change the text.
+        if not self.stream:
+            return
+
+        rows = numpy.array([row for row in rows.tolist() if row not in self.streamed and row not in self.scanned],
+                           dtype=numpy.int64)
+        rows = rows[compile_mask(comments, self.filters, rows)]
+
+        if not loaded:
+            rows = archive.matching_rows(self.profile[0], comments, rows, self.search_text, self.filters)
+
+        if self.matcher is None:
+            self.output_streamed_comments(comments, rows.tolist())
+            return
+
+        # Regex and fuzzy matches are shown a chunk at a time as the scan gets through them
+        self.scanned.update(rows.tolist())
+        for matched in self.matcher.matches(comments, rows, stopped=lambda: self.stopped):
+            self.output_streamed_comments(comments, matched.tolist())
+
+    def output_streamed_comments(self, comments, rows):
+        if rows:
+            self.streamed.update(rows)
+            self.output_comment.emit({"index": len(self.streamed), "records": comments, "rows": rows})
+
+    def stream_enriched_comments(self, archive, comments, batches):
+        if not self.stream or not batches:
+            return
+
+        rows = []
+        for comment_info in batches:
+            for comment_id, fields in comment_info.items():
+                if comment_id in comments:
+                    comments.apply_fields(comment_id, fields)
+                    rows.append(comments.rows[comment_id])
+
+        # The full-text index is kept up to date as content is gathered
+        archive.store(self.profile[0], comments, rows)
+        self.stream_comments(archive, comments, numpy.array(rows, dtype=numpy.int64))
 
     def filter_comments(self, comments):
         if self.stopped:
@@ -590,58 +711,16 @@ class ThreadGatherComments(QThread):
 
         try:
             log("Filtering comments...")
-            self.thread_status.emit(f"Filtering comments... (0/{len(comments)})")
-
-            for index, comment_id in enumerate(comments):
-                score = comments[comment_id]["score"]
-                awarded = comments[comment_id]["awarded"]
-                edited = comments[comment_id]["edited"]
-                removed = comments[comment_id]["removed"]
-
-                if score != "Unknown":
-                    if score < self.filters["Score"][0] or score > self.filters["Score"][1]:
-                        comments[comment_id]["drop"] = True
-
-                if awarded != "Unknown":
-                    if self.filters["Awarded"] != 0:
-                        if self.filters["Awarded"] == 1:
-                            comments[comment_id]["drop"] = not awarded
-                        else:
-                            comments[comment_id]["drop"] = bool(awarded)
-                else:
-                    if self.filters["Awarded"] != 0:
-                        comments[comment_id]["drop"] = True
-
-                if edited != "Unknown":
-                    if self.filters["Edited"] != 0:
-                        if self.filters["Edited"] == 1:
-                            comments[comment_id]["drop"] = True if edited is False else False
-                        else:
-                            comments[comment_id]["drop"] = True if edited is not False else False
-                else:
-                    if self.filters["Edited"] != 0:
-                        comments[comment_id]["drop"] = True
-
-                if removed != "Unknown":
-                    if self.filters["Removed"] != 0:
-                        if self.filters["Removed"] == 1:
-                            comments[comment_id]["drop"] = True if removed is False else False
-                        else:
-                            comments[comment_id]["drop"] = True if removed is not False else False
-
-                self.thread_status.emit(f"Filtering comments... ({index}/{len(comments) - 1})")
-                self.thread_progress.emit((index / len(comments) * 100))
-
-            if self.filters["Sort"] == 0:
-                comments = OrderedDict((sorted((kv for kv in comments.items()), key=lambda kv: kv[1]['created'],
-                                               reverse=True)))
-            else:
-                comments_score_unknown = OrderedDict(kv for kv in comments.items() if kv[1]['score'] == "Unknown")
-                comments = OrderedDict(kv for kv in comments.items() if kv[1]['score'] != "Unknown")
-                comments = OrderedDict((sorted((kv for kv in comments.items()), key=lambda kv: kv[1]['score'],
-                                               reverse=True)))
-                comments = OrderedDict([kv for kv in comments.items()] + [kv for kv in comments_score_unknown.items()])
+            self.thread_status.emit(f"Filtering comments... ({len(comments)} comments)")
+
+            mask = compile_mask(comments, self.filters)
+            mask[self.unmatched] = False
 
+            comments.selection = numpy.flatnonzero(mask)
+            if self.matcher is not None:
+                comments.selection = self.match_comments(comments, comments.selection)
+
+            self.thread_progress.emit(100)
             log("Done filtering comments!")
         except Exception as e:
             if not self.stopped:
@@ -651,34 +730,126 @@ class ThreadGatherComments(QThread):
 
         return comments
 
+    def match_comments(self, comments, rows):
+        # Scans the text of the rows that pass the filters. Rows already scanned while streaming are kept if they
+        # were shown and dropped if they weren't.
+        log(f"Scanning comment text ({self.filters['Search Mode']})...")
+        self.thread_status.emit(f"Scanning comments... ({len(rows)} comments)")
+
+        scanned = numpy.isin(rows, numpy.fromiter(self.scanned, dtype=numpy.int64))
+        streamed = rows[scanned & numpy.isin(rows, numpy.fromiter(self.streamed, dtype=numpy.int64))]
+        matched = self.matcher.matching_rows(comments, rows[~scanned], stopped=lambda: self.stopped)
+
+        log(f"Done scanning comment text! ({len(streamed) + len(matched)} matches)")
+        return numpy.sort(numpy.concatenate([streamed, matched]))
+
+    def sort_comments(self, comments):
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
+
+        try:
+            log("Sorting comments...")
+
+            comments.selection = sort_order(comments, comments.selected_rows(), self.filters["Sort"])
+
+            log("Done sorting comments!")
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
+
+        return comments
+
     def output_comments(self, comments):
         if self.stopped:
             self.thread_status.emit("Process stopped by user...")
             return
 
         log("Outputting comments...")
-        self.thread_status.emit(f"Outputting comments... (0/{len(comments)})")
+        rows = comments.selected_rows()
+        if self.streamed:
+            rows = rows[~numpy.isin(rows, numpy.fromiter(self.streamed, dtype=numpy.int64))]
+
+        progress = ProgressReporter("Outputting comments", len(rows), self.thread_status.emit,
+                                    self.thread_progress.emit)
+        progress.flush()
 
         try:
-            for index, comment_id in enumerate(comments):
+            for start in range(0, len(rows), OUTPUT_BATCH_SIZE):
                 if self.stopped:
                     self.thread_status.emit("Process stopped by user...")
                     return
 
-                if comments[comment_id]["drop"] is False:
-                    self.output_comment.emit({"index": index, "id": comment_id,
-                                              "data": comments[comment_id], "num_comments": len(comments)})
+                batch = rows[start:start + OUTPUT_BATCH_SIZE].tolist()
+                self.output_comment.emit({"index": start, "records": comments, "rows": batch})
+                progress.update(start + len(batch))
+
+            progress.finish()
+            log(f"Done outputting comments! ({progress.rate():.0f} comments/s)")
+        except Exception as e:
+            if not self.stopped:
+                log(e)
+                self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
+            return
+
+    def stop_thread(self):
+        self.stopped = True
 
-                self.thread_status.emit(f"Outputting comments... ({index}/{len(comments) - 1})")
-                self.thread_progress.emit(index / len(comments) * 100)
 
-            log("Done outputting comments!")
+class ThreadMigrateSubs(QThread):
+    thread_progress = Signal(int)
+    thread_status = Signal(str)
+
+    def __init__(self, parent, profile_from, profile_to):
+        self.stopped = False
+        self.parent = parent
+        self.profile_from = profile_from
+        self.profile_to = profile_to
+
+        super().__init__()
+
+    def run(self):
+        log("Migrating subs...")
+        self.thread_status.emit("Getting subscriptions...")
+
+        retry = RetryPolicy(stopped=lambda: self.stopped, on_retry=log_retry)
+        failed = 0
+
+        try:
+            reddit_from = reddit_login(self.profile_from)
+            reddit_to = reddit_login(self.profile_to)
+
+            # Subreddits the target account already subscribes to are left out, so no request is spent on them
+            subreddits = subscribed_names(reddit_from, retry)
+            missing = missing_subscriptions(subreddits, subscribed_names(reddit_to, retry))
+            log(f"{len(subreddits)} subscriptions found, {len(missing)} to migrate")
+
+            progress = ProgressReporter("Migrating subs", len(missing), self.thread_status.emit,
+                                        self.thread_progress.emit)
+            migrator = SubscriptionMigrator(reddit_to, stopped=lambda: self.stopped, retry=retry)
+
+            for name, error in migrator.subscribe(missing):
+                if error is not None:
+                    failed += 1
+                    log(f"Couldn't subscribe to r/{name}: {error}")
+
+                progress.advance()
         except Exception as e:
             if not self.stopped:
                 log(e)
                 self.thread_status.emit("Process ran into error. Please try again in a few minutes...")
             return
 
+        if self.stopped:
+            self.thread_status.emit("Process stopped by user...")
+            return
+
+        log("Done migrating subreddits!")
+        self.thread_status.emit(f"Done! {len(missing) - failed} subscribed. | "
+                                f"{len(subreddits) - len(missing)} already subscribed. | {failed} failed.")
+
     def stop_thread(self):
         self.stopped = True
 
@@ -872,6 +1043,7 @@ class MainWindow(QMainWindow):
 
         self.prev_max = 0
         self.current_process = None
+        self.resumable = []
 
         try:
             self.ui = UIMainWindow()
@@ -883,7 +1055,14 @@ class MainWindow(QMainWindow):
 
         log("Starting timer...")
 
-        self.ui.content_tree.itemDoubleClicked.connect(self.open_link)
+        self.content_model = ContentModel(self)
+        self.ui.content_tree.setModel(self.content_model)
+        self.ui.content_tree.setColumnWidth(0, 505)
+        self.ui.content_tree.doubleClicked.connect(self.open_link)
+
+        self.profile_registry = ProfileRegistry(parent=self)
+        self.profile_registry.profiles_changed.connect(self.update_profiles)
+        self.update_profiles(self.profile_registry.names)
 
         try:
             self.update_timer = QTimer(self)
@@ -893,22 +1072,24 @@ class MainWindow(QMainWindow):
         except Exception as e:
             log(e)
 
-    def updater(self):
-        # This is a function that runs on an interval and continuously updates the UI
-        profiles = []
+    def update_profiles(self, names):
+        # Runs whenever the profile registry sees a profile added to or removed from the profiles directory
+        listed = set()
 
-        for profile_index in range(self.ui.profile_list.count()):
-            profiles.append(self.ui.profile_list.item(profile_index))
+        for profile_index in reversed(range(self.ui.profile_list.count())):
+            profile = self.ui.profile_list.item(profile_index)
 
-        for rpf_file in os.listdir("profiles"):
-            if rpf_file.split(".")[0] not in [profile.text() for profile in profiles]:
-                self.ui.profile_list.addItem(rpf_file.split(".")[0])
+            if profile.text() in names:
+                listed.add(profile.text())
+            else:
+                self.ui.profile_list.takeItem(profile_index)
 
-        for profile in profiles:
-            if (profile.text() + ".rpf") not in os.listdir("profiles"):
-                if (profile.text() + ".txt") not in os.listdir("profiles"):
-                    self.ui.profile_list.takeItem(self.ui.profile_list.row(profile))
+        for name in names:
+            if name not in listed:
+                self.ui.profile_list.addItem(name)
 
+    def updater(self):
+        # This is a function that runs on an interval and continuously updates the UI
         self.ui.modify_profile_action.setDisabled(len(self.ui.profile_list.selectedItems()) == 0)
         self.ui.export_profile_action.setDisabled(len(self.ui.profile_list.selectedItems()) == 0)
 
@@ -916,9 +1097,11 @@ class MainWindow(QMainWindow):
         self.ui.migrate_profile_button.setDisabled(not len(self.ui.profile_list.selectedItems()) == 2)
 
         self.ui.submission_search_button.setDisabled(not len(self.ui.profile_list.selectedItems()) == 1)
-        self.ui.submission_dump_button.setDisabled(not len(self.ui.content_tree.selectedItems()))
-        self.ui.submission_delete_button.setDisabled(not len(self.ui.content_tree.selectedItems()))
-        self.ui.submission_clear_btn.setDisabled(not len(self.ui.content_tree.selectedItems()))
+        has_selection = self.ui.content_tree.selectionModel().hasSelection()
+        self.ui.submission_dump_button.setDisabled(not has_selection)
+        self.ui.submission_delete_button.setDisabled(not has_selection)
+        self.ui.submission_clear_btn.setDisabled(not has_selection)
+        self.ui.submission_resume_button.setDisabled(not self.resumable)
 
         try:
             layouts = [self.ui.profile_layout, self.ui.filter_layout]
@@ -934,9 +1117,11 @@ class MainWindow(QMainWindow):
             if not self.background_thread.isRunning():
                 self.ui.submission_progress_bar.setValue(0)
 
-            self.ui.content_tree.setDisabled(self.background_thread.isRunning())
+            # Streamed results can be browsed and selected while a search is still running
+            self.ui.content_tree.setDisabled(self.background_thread.isRunning() and self.current_process != "Search")
 
             self.ui.submission_label.setDisabled(self.background_thread.isRunning())
+            self.ui.submission_load_button.setDisabled(self.background_thread.isRunning())
             self.ui.submission_search_bar.setDisabled(self.background_thread.isRunning())
             self.ui.profile_menu.setDisabled(self.background_thread.isRunning())
             self.ui.autodelete_menu.setDisabled(self.background_thread.isRunning())
@@ -948,6 +1133,7 @@ class MainWindow(QMainWindow):
 
                 self.ui.submission_dump_button.setDisabled(True)
                 self.ui.submission_delete_button.setDisabled(True)
+                self.ui.submission_resume_button.setDisabled(True)
                 self.ui.submission_clear_btn.setDisabled(True)
             elif self.background_thread.isRunning() and self.current_process == "Delete":
                 self.ui.submission_delete_button.setText("Cancel")
@@ -956,6 +1142,18 @@ class MainWindow(QMainWindow):
 
                 self.ui.submission_search_button.setDisabled(True)
                 self.ui.submission_dump_button.setDisabled(True)
+                self.ui.submission_resume_button.setDisabled(True)
+                self.ui.submission_clear_btn.setDisabled(True)
+            elif self.background_thread.isRunning() and self.current_process == "Migrate":
+                self.ui.migrate_profile_button.setText("Cancel")
+                self.ui.migrate_profile_button.setDisabled(False)
+                self.ui.migrate_profile_button.clicked.disconnect()
+                self.ui.migrate_profile_button.clicked.connect(lambda: self.background_thread.stop_thread())
+
+                self.ui.submission_search_button.setDisabled(True)
+                self.ui.submission_dump_button.setDisabled(True)
+                self.ui.submission_delete_button.setDisabled(True)
+                self.ui.submission_resume_button.setDisabled(True)
                 self.ui.submission_clear_btn.setDisabled(True)
             else:
                 self.current_process = None
@@ -967,6 +1165,10 @@ class MainWindow(QMainWindow):
                 self.ui.submission_delete_button.setText("Delete")
                 self.ui.submission_delete_button.clicked.disconnect()
                 self.ui.submission_delete_button.clicked.connect(self.delete_content)
+
+                self.ui.migrate_profile_button.setText("Migrate Subs")
+                self.ui.migrate_profile_button.clicked.disconnect()
+                self.ui.migrate_profile_button.clicked.connect(self.migrate_content)
         except:
             pass
 
@@ -983,7 +1185,10 @@ class MainWindow(QMainWindow):
             self.ui.submission_search_button.clicked.connect(self.search_content)
             self.ui.submission_clear_btn.clicked.connect(self.clear_content)
             self.ui.submission_delete_button.clicked.connect(self.delete_content)
+            self.ui.submission_resume_button.clicked.connect(self.resume_delete)
+            self.ui.profile_list.itemSelectionChanged.connect(self.refresh_resumable)
             self.ui.submission_dump_button.clicked.connect(self.dump_content)
+            self.ui.submission_load_button.clicked.connect(self.load_content)
             self.ui.migrate_profile_button.clicked.connect(self.migrate_content)
 
             log("Functions connected successfully!")
@@ -1059,7 +1264,7 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 log(e)
 
-    def search_content(self):
+    def current_filters(self):
         filters = {}
 
         search_text = self.ui.submission_search_bar.text()
@@ -1072,6 +1277,18 @@ class MainWindow(QMainWindow):
         filters["Edited"] = self.ui.edited_combo.currentIndex()
         filters["Subreddit"] = self.ui.subreddit_edit.text().replace("r/", "")
         filters["Removed"] = self.ui.removed_combo.currentIndex()
+        filters["Search Mode"] = SEARCH_MODES[self.ui.search_mode_combo.currentIndex()]
+
+        return search_text, filters
+
+    def search_content(self):
+        search_text, filters = self.current_filters()
+
+        try:
+            text_matcher(search_text, filters)
+        except re.error as e:
+            self.set_status(f"Invalid regex: {e}")
+            return
 
         try:
             with open(f"profiles/{self.ui.profile_list.selectedItems()[0].text()}.rpf") as file:
@@ -1080,15 +1297,17 @@ class MainWindow(QMainWindow):
 
             log("Starting background thread...")
 
-            self.ui.content_tree.clear()
+            self.content_model.clear(sort=filters["Sort"])
+            stream = self.ui.stream_check.isChecked()
+            refresh = self.ui.refresh_check.isChecked()
 
             if self.ui.comment_radio.isChecked():
-                self.background_thread = ThreadGatherComments(self, profile, search_text, filters)
-                self.background_thread.output_comment.connect(self.add_comment_to_gui)
+                self.background_thread = ThreadGatherComments(self, profile, search_text, filters, stream, refresh)
+                self.background_thread.output_comment.connect(self.add_content_to_gui)
                 self.current_search = "comments"
             else:
-                self.background_thread = ThreadGatherPosts(self, profile, search_text, filters)
-                self.background_thread.output_post.connect(self.add_post_to_gui)
+                self.background_thread = ThreadGatherPosts(self, profile, search_text, filters, stream, refresh)
+                self.background_thread.output_post.connect(self.add_content_to_gui)
                 self.current_search = "posts"
 
             self.background_thread.thread_progress.connect(self.set_progress)
@@ -1099,109 +1318,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             log(e)
 
-    def add_comment_to_gui(self, comment):
+    def add_content_to_gui(self, content):
         try:
-            comment_id = comment["id"]
-            comment_date = datetime.datetime.fromtimestamp(comment["data"]["created"]).strftime('%m/%d/%Y %I:%M %p')
-            comment_removed = comment["data"]["removed"]
-            comment_body = textwrap.wrap(comment["data"]["body"], 55)
-            comment_subreddit = comment["data"]["subreddit"]
-            comment_link = f"https://www.reddit.com{comment['data']['permalink']}"
-            comment_score = comment["data"]["score"]
-            comment_edited = "Yes" if comment["data"]["edited"] else "No"
-            if comment["data"]["awarded"] != "Unknown":
-                comment_awarded = "Yes" if comment["data"]["awarded"] else "No"
-            else:
-                comment_awarded = "Unknown"
-
-            comment_branch = QTreeWidgetItem([comment_id, comment_date, comment_removed])
-            comment_body_sub_branch = QTreeWidgetItem(["Body"])
-            comment_subreddit_leaf = QTreeWidgetItem([f"Subreddit: r/{comment_subreddit}"])
-            comment_score_leaf = QTreeWidgetItem([f"Score: {comment_score}"])
-            comment_edited_leaf = QTreeWidgetItem([f"Edited: {comment_edited}"])
-            comment_awarded_leaf = QTreeWidgetItem([f"Awarded: {comment_awarded}"])
-            comment_link_leaf = QTreeWidgetItem(["L͟i͟n͟k͟"])
-
-            self.ui.content_tree.addTopLevelItem(comment_branch)
-            comment_branch.addChildren([comment_body_sub_branch, comment_subreddit_leaf, comment_score_leaf,
-                                        comment_edited_leaf, comment_awarded_leaf, comment_link_leaf])
-            comment_body_sub_branch.addChildren([QTreeWidgetItem([line]) for line in comment_body])
-
-            for c in [comment_branch.child(c) for c in range(comment_branch.childCount())]:
-                c.setFlags(c.flags() & ~Qt.ItemIsSelectable)
-            for c in [comment_body_sub_branch.child(c) for c in range(comment_body_sub_branch.childCount())]:
-                c.setFlags(c.flags() & ~Qt.ItemIsSelectable)
-
-            if comment["index"] % 2 == 0:
-                comment_branch.setBackgroundColor(0, QColor(220, 220, 220))
-                comment_branch.setBackgroundColor(1, QColor(220, 220, 220))
-
-            comment_link_leaf.setTextColor(0, QColor(0, 0, 238))
-            comment_link_leaf.setStatusTip(0, comment_link)
-
-            if comment["data"]["removed"]:
-                comment_branch.setTextColor(0, QColor(255, 0, 0))
-                comment_branch.setStatusTip(0, "Removed Content")
-            else:
-                comment_branch.setStatusTip(0, "Reddit Content")
-
-        except Exception as e:
-            log(e)
-
-    def add_post_to_gui(self, post):
-        try:
-            post_id = post["id"]
-            post_date = datetime.datetime.fromtimestamp(post["data"]["created"]).strftime('%m/%d/%Y %I:%M %p')
-            post_title = textwrap.wrap(post["data"]["title"], 55)
-            post_removed = post["data"]["removed"]
-            post_selftext = textwrap.wrap(post["data"]["selftext"], 55)
-            post_subreddit = post["data"]["subreddit"]
-            post_link = f"https://www.reddit.com{post['data']['permalink']}"
-            post_score = post["data"]["score"]
-            post_edited = "Yes" if post["data"]["edited"] else "No"
-            if post["data"]["awarded"] != "Unknown":
-                post_awarded = "Yes" if post["data"]["awarded"] else "No"
-            else:
-                post_awarded = "Unknown"
-
-            post_branch = QTreeWidgetItem([post_id, post_date, post_removed])
-            post_selftext_sub_branch = QTreeWidgetItem(["SelfText"])
-            post_title_sub_branch = QTreeWidgetItem(["Title"])
-            post_subreddit_leaf = QTreeWidgetItem([f"Subreddit: r/{post_subreddit}"])
-            post_score_leaf = QTreeWidgetItem([f"Score: {post_score}"])
-            post_edited_leaf = QTreeWidgetItem([f"Edited: {post_edited}"])
-            post_awarded_leaf = QTreeWidgetItem([f"Awarded: {post_awarded}"])
-            post_link_leaf = QTreeWidgetItem(["L͟i͟n͟k͟"])
-
-            self.ui.content_tree.addTopLevelItem(post_branch)
-            post_branch.addChildren([post_title_sub_branch, post_selftext_sub_branch, post_subreddit_leaf,
-                                     post_score_leaf, post_edited_leaf, post_awarded_leaf, post_link_leaf])
-            post_selftext_sub_branch.addChildren([QTreeWidgetItem([line]) for line in post_selftext])
-            post_title_sub_branch.addChildren([QTreeWidgetItem([line]) for line in post_title])
-
-            if post["data"]["selftext"] == "":
-                post_branch.takeChild(1)
-
-            for c in [post_branch.child(c) for c in range(post_branch.childCount())]:
-                c.setFlags(c.flags() & ~Qt.ItemIsSelectable)
-            for c in [post_selftext_sub_branch.child(c) for c in range(post_selftext_sub_branch.childCount())]:
-                c.setFlags(c.flags() & ~Qt.ItemIsSelectable)
-
-            if post["index"] % 2 == 0:
-                post_branch.setBackgroundColor(0, QColor(220, 220, 220))
-                post_branch.setBackgroundColor(1, QColor(220, 220, 220))
-
-            post_link_leaf.setTextColor(0, QColor(0, 0, 238))
-            post_link_leaf.setStatusTip(0, post_link)
-
-            if post["data"]["removed"]:
-                post_branch.setTextColor(0, QColor(255, 0, 0))
-                post_branch.setStatusTip(0, "Removed Content")
-            else:
-                post_branch.setStatusTip(0, "Reddit Content")
-
+            # One bulk insertion per batch, with the view repainted once it's in
+            self.ui.content_tree.setUpdatesEnabled(False)
+            self.content_model.append_rows(content["records"], content["rows"])
         except Exception as e:
             log(e)
+        finally:
+            self.ui.content_tree.setUpdatesEnabled(True)
 
     def set_progress(self, progress):
         self.ui.submission_progress_bar.setValue(progress)
@@ -1209,12 +1334,17 @@ class MainWindow(QMainWindow):
     def set_status(self, status):
         self.ui.submission_progress_status.setText(status)
 
+    def selected_positions(self):
+        # Read from the selection's ranges rather than selectedRows, which builds an index for every selected row
+        positions = set()
+        for selection_range in self.ui.content_tree.selectionModel().selection():
+            if not selection_range.parent().isValid():
+                positions.update(range(selection_range.top(), selection_range.bottom() + 1))
+
+        return sorted(positions)
+
     def clear_content(self):
-        while len(self.ui.content_tree.selectedItems()) != 0:
-            for index in range(self.ui.content_tree.topLevelItemCount()):
-                if isinstance(self.ui.content_tree.topLevelItem(index), QTreeWidgetItem):
-                    if self.ui.content_tree.topLevelItem(index).isSelected():
-                        self.ui.content_tree.takeTopLevelItem(index)
+        self.content_model.remove_positions(self.selected_positions())
 
     def delete_content(self):
         with open(f"profiles/{self.current_profile}.rpf") as file:
@@ -1222,82 +1352,149 @@ class MainWindow(QMainWindow):
 
             profile = [line.replace("\n", "") for line in file_lines]
 
-        self.background_thread = ThreadDeleteContent(self, profile)
+        # The selection is turned into a list of IDs here, so the delete thread never reads the view
+        model = self.content_model
+        targets = []
+        skipped = []
+        for position in self.selected_positions():
+            row = model.store_row(position)
+            (skipped if model.is_removed(row) else targets).append((model.records.kind, model.records.ids[row]))
+
+        self.start_delete(profile, self.ui.overwrite_check.isChecked(), targets=targets, skipped=skipped)
+
+    def resume_delete(self):
+        # Picks up the selected profile's most recent interrupted deletion job where it left off
+        with open(f"profiles/{self.ui.profile_list.selectedItems()[0].text()}.rpf") as file:
+            file_lines = file.readlines()
+
+            profile = [line.replace("\n", "") for line in file_lines]
+
+        journal = self.resumable[0]
+        log(f"Resuming deletion job {journal.path} ({len(journal.remaining())} items left)...")
+
+        self.start_delete(profile, journal.overwrite, journal=journal)
+
+    def refresh_resumable(self):
+        self.resumable = []
+
+        if len(self.ui.profile_list.selectedItems()) != 1:
+            return
+
+        try:
+            with open(f"profiles/{self.ui.profile_list.selectedItems()[0].text()}.rpf") as file:
+                profile = [line.replace("\n", "") for line in file.readlines()]
+
+            self.resumable = unfinished_journals(profile[0])
+        except Exception as e:
+            log(e)
+
+    def start_delete(self, profile, overwrite, targets=(), skipped=(), journal=None):
+        self.background_thread = ThreadDeleteContent(self, profile, targets, skipped, overwrite, journal)
+        self.background_thread.finished.connect(self.refresh_resumable)
         self.background_thread.thread_status.connect(self.set_status)
         self.background_thread.thread_progress.connect(self.set_progress)
-        self.background_thread.remove_comment.connect(self.remove_content_from_gui)
+        self.background_thread.content_results.connect(self.apply_delete_results)
         self.background_thread.start()
 
         self.current_process = "Delete"
 
-    def remove_content_from_gui(self, index):
-        self.ui.content_tree.takeTopLevelItem(index)
+    def apply_delete_results(self, results):
+        # Marks a batch of deleted items as removed and deselects them along with the skipped ones. Failed items stay
+        # selected, and items that aren't shown (from a resumed job) are ignored.
+        model = self.content_model
+        if model.records is None:
+            return
+
+        deselected = QItemSelection()
+        for kind, content_id, outcome in results:
+            row = model.records.rows.get(content_id) if kind == model.records.kind else None
+            if row is None or outcome == "failed":
+                continue
+
+            if outcome == "deleted":
+                model.mark_removed(row)
+
+            index = model.top_index(row)
+            if index.isValid():
+                deselected.select(index, index.siblingAtColumn(1))
 
-    def open_link(self, item):
-        if item.text(0) == "L͟i͟n͟k͟":
-            webbrowser.open(item.statusTip(0))
-            item.setTextColor(0, QColor(85, 26, 139))
+        self.ui.content_tree.selectionModel().select(deselected, QItemSelectionModel.Deselect)
+
+    def open_link(self, index):
+        link = self.content_model.link(index)
+
+        if link is not None:
+            webbrowser.open(link)
+            self.content_model.mark_visited(index)
 
     def dump_content(self):
         file_dialog = QFileDialog(self)
         options = QFileDialog.Options()
         options |= QFileDialog.DontUseNativeDialog
-        filters = "JSON (*.json);;HTML (*.html);;Comma-separated (*.csv)"
+        filters = "JSON (*.json);;JSON Lines (*.jsonl);;HTML (*.html);;Comma-separated (*.csv);;" \
+                  "Parquet (*.parquet);;Arrow IPC (*.arrow)"
         save_file = file_dialog.getSaveFileName(self, "reddit file", "", filter=filters, options=options)
 
+        if not save_file[0]:
+            return
+
+        extension = save_file[1].split("*")[1][:-1]
+        path = save_file[0] if save_file[0].endswith(extension) else save_file[0] + extension
+
         log("Dumping data to file...")
 
-        if self.current_search == "comments":
-            content_data = pandas.DataFrame(columns=["id", "created", "body", "subreddit", "score",
-                                                     "edited", "awarded", "link"])
-
-            for item in self.ui.content_tree.selectedItems():
-                id = item.text(0)
-                created = item.text(1)
-                body = " ".join([item.child(0).child(i).text(0) for i in range(item.child(0).childCount())])
-                subreddit = item.child(1).text(0)
-                score = item.child(2).text(0)
-                edited = item.child(3).text(0)
-                awarded = item.child(4).text(0)
-                link = item.child(5).statusTip(0)
-
-                content_data.loc[len(content_data)] = [id, created, body, subreddit, score, edited, awarded, link]
-        else:
-            content_data = pandas.DataFrame(columns=["id", "created", "title", "selftext", "subreddit", "score",
-                                                     "edited", "awarded", "link"])
+        try:
+            rows = [self.content_model.store_row(position) for position in self.selected_positions()]
+            export_records(self.content_model.records, rows, path, extension[1:])
 
-            for item in self.ui.content_tree.selectedItems():
-                shift = 0
-                if item.child(1).text(0) == "SelfText":
-                    selftext = " ".join([item.child(1).child(i).text(0) for i in range(item.child(1).childCount())])
-                else:
-                    selftext = None
-                    shift = 1
-
-                id = item.text(0)
-                created = item.text(1)
-                title = " ".join([item.child(0).child(i).text(0) for i in range(item.child(0).childCount())])
-                subreddit = item.child(2 - shift).text(0)
-                score = item.child(3 - shift).text(0)
-                edited = item.child(4 - shift).text(0)
-                awarded = item.child(5 - shift).text(0)
-                link = item.child(6 - shift).statusTip(0)
-
-                content_data.loc[len(content_data)] = [id, created, title, selftext, subreddit,
-                                                       score, edited, awarded, link]
-
-        if "json" in save_file[1]:
-            content_data.to_json(save_file[0] + "".join(save_file[1].split("*")[1][:-1]))
-        elif "html" in save_file[1]:
-            content_data.to_html(save_file[0] + "".join(save_file[1].split("*")[1][:-1]), index=False)
-        elif "csv" in save_file[1]:
-            content_data.to_csv(save_file[0] + "".join(save_file[1].split("*")[1][:-1]), index=False)
-
-        log(f'Done dumping content to {save_file[0] + "".join(save_file[1].split("*")[1][:-1])}')
+            log(f"Done dumping {len(rows)} {self.current_search} to {path}")
+        except Exception as e:
+            log(e)
+            self.set_status(f"Dump failed: {e}")
 
-    def migrate_content(self):
-        log("Migrating subs...")
+    def load_content(self):
+        # Loads a Parquet or Arrow dump into the results pane, applying the current search and filters to it
+        file_dialog = QFileDialog(self)
+        options = QFileDialog.Options()
+        options |= QFileDialog.DontUseNativeDialog
+        filters = "Content dumps (*.parquet *.arrow)"
+        load_file = file_dialog.getOpenFileName(self, "Load reddit file", "", filter=filters, options=options)
+
+        if not load_file[0]:
+            return
+
+        log(f"Loading content from {load_file[0]}...")
+
+        try:
+            records = import_records(load_file[0])
+            search_text, filters = self.current_filters()
+
+            # The dump is indexed in a throwaway in-memory archive so the search means the same as for gathered content
+            archive = ContentArchive(":memory:")
+            archive.store("dump", records)
+            matcher = text_matcher(search_text, filters)
+            rows = numpy.flatnonzero(compile_mask(records, filters))
+            rows = archive.matching_rows("dump", records, rows, search_text if matcher is None else "", filters)
+            if matcher is not None:
+                rows = matcher.matching_rows(records, rows)
+            rows = sort_order(records, rows, filters["Sort"])
+            archive.close()
+
+            self.content_model.clear(sort=filters["Sort"])
+            self.content_model.append_rows(records, rows.tolist())
+            self.current_search = records.kind
+
+            if len(self.ui.profile_list.selectedItems()) == 1:
+                self.current_profile = self.ui.profile_list.selectedItems()[0].text()
+
+            self.set_status(f"Loaded {len(rows)} of {len(records)} {records.kind} "
+                            f"from {os.path.basename(load_file[0])}")
+            log(f"Done loading {len(records)} {records.kind}!")
+        except Exception as e:
+            log(e)
+            self.set_status(f"Load failed: {e}")
 
+    def migrate_content(self):
         with open(f"profiles/{self.ui.profile_list.selectedItems()[0].text()}.rpf") as file:
             file_lines = file.readlines()
 
@@ -1308,28 +1505,12 @@ class MainWindow(QMainWindow):
 
             profile_from = [line.replace("\n", "") for line in file_lines]
 
-        reddit = praw.Reddit(username=profile_from[0],
-                             password=profile_from[1],
-                             client_id=profile_from[2],
-                             client_secret=profile_from[3],
-                             user_agent="Reddit Content Manager")
-
-        subreddits = [subreddit.display_name for subreddit in reddit.user.subreddits(limit=100)]
-
-        reddit = praw.Reddit(username=profile_to[0],
-                             password=profile_to[1],
-                             client_id=profile_to[2],
-                             client_secret=profile_to[3],
-                             user_agent="Reddit Content Manager")
-
-        for subreddit in subreddits:
-            try:
-                subreddit = reddit.subreddit(subreddit)
-                subreddit.subscribe()
-            except Exception as e:
-                log(e)
+        self.background_thread = ThreadMigrateSubs(self, profile_from, profile_to)
+        self.background_thread.thread_status.connect(self.set_status)
+        self.background_thread.thread_progress.connect(self.set_progress)
+        self.background_thread.start()
 
-        log("Done migrating subreddits!")
+        self.current_process = "Migrate"
 
 
 def log(log_string):
@@ -1347,6 +1528,21 @@ def log(log_string):
     print(f"({datetime.datetime.now()}) - {log_string}")
 
 
+def reddit_login(profile):
+    reddit = praw.Reddit(username=profile[0],
+                         password=profile[1],
+                         client_id=profile[2],
+                         client_secret=profile[3],
+                         user_agent="Reddit Content Manager")
+    reddit.validate_on_submit = True
+
+    return reddit
+
+
+def log_retry(error, delay):
+    log(f"Request failed ({error}). Retrying in {delay:.1f} seconds...")
+
+
 def main():
     log("Starting program...")
 
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+
+def normalize_query(url):
+    # Two links asking for the same page must map to the same key, whatever order their parameters were written in
+    parsed = urllib.parse.urlsplit(url)
+    parameters = sorted((key, value.lower() if key == "author" else value)
+                        for key, value in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+
+    return json.dumps([parsed.netloc.lower(), parsed.path.rstrip("/"), parameters])
+
+
+class ResponseCache:
+    # Content-addressed on-disk cache for PushShift pages. Entries expire after ttl seconds and the least recently used
+    # ones are evicted once the cache grows past max_bytes. A file's modification time is its last use.
+    def __init__(self, directory="cache/pushshift", ttl=6 * 60 * 60, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = {}  # key -> [size, last_used]
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".json"):
+                file_stat = os.stat(os.path.join(directory, file_name))
+                self.entries[file_name[:-5]] = [file_stat.st_size, file_stat.st_mtime]
+                self.total_bytes += file_stat.st_size
+
+    def key(self, url):
+        return hashlib.sha256(normalize_query(url).encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, url):
+        key = self.key(url)
+
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+
+        try:
+            with open(self.path(key), encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is None or time.time() - entry["created"] > self.ttl:
+            self.remove(key)
+
+            with self.lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(self.path(key), (now, now))
+        except OSError:
+            pass
+
+        with self.lock:
+            self.hits += 1
+            if key in self.entries:
+                self.entries[key][1] = now
+
+        return entry["data"]
+
+    def put(self, url, data):
+        key = self.key(url)
+        temp_path = self.path(key) + f".{threading.get_ident()}.tmp"
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"created": time.time(), "url": url, "data": data}, file)
+
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, self.path(key))
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries[key][0]
+
+            self.entries[key] = [size, time.time()]
+            self.total_bytes += size
+
+        self.evict()
+
+    def remove(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[0]
+
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        with self.lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+
+            by_last_use = sorted(self.entries, key=lambda entry_key: self.entries[entry_key][1])
+
+        for key in by_last_use:
+            with self.lock:
+                if self.total_bytes <= self.max_bytes:
+                    return
+
+            self.remove(key)
@@ -0,0 +1,95 @@
+import email.utils
+import random
+import time
+import prawcore
+import requests
+
+RETRY_STATUSES = [408, 429, 500, 502, 503, 504, 520, 521, 522, 524]
+
+
+def error_response(error):
+    # The HTTP response behind a requests or prawcore error, if there was one
+    return getattr(error, "response", None)
+
+
+def is_transient(error):
+    # Rate limiting, server errors, timeouts and dropped connections are worth another try. Anything else (bad
+    # credentials, missing content, a bad request...) fails the same way every time.
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, prawcore.exceptions.RequestException,
+                          prawcore.exceptions.ServerError, prawcore.exceptions.TooManyRequests)):
+        return True
+
+    response = error_response(error)
+    return isinstance(error, (requests.HTTPError, prawcore.exceptions.ResponseException)) and \
+        response is not None and response.status_code in RETRY_STATUSES
+
+
+def retry_after(error):
+    # Seconds the server asked us to wait, from Retry-After (seconds or an HTTP date) or from an exhausted
+    # X-Ratelimit-Remaining with its X-Ratelimit-Reset. None if it didn't say.
+    response = error_response(error)
+    if response is None:
+        return
+
+    headers = response.headers
+    value = headers.get("Retry-After")
+
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    try:
+        if float(headers.get("X-Ratelimit-Remaining", 1)) < 1:
+            return max(0.0, float(headers.get("X-Ratelimit-Reset", 0)))
+    except ValueError:
+        pass
+
+
+class RetryPolicy:
+    # Retries calls that failed for a transient reason, waiting longer after each failure. The wait is exponential
+    # backoff with full jitter, so concurrent workers that failed together don't retry together, unless the server
+    # said how long to wait, in which case that is waited out (plus a little jitter). Waiting stops early once the
+    # caller is stopped, and the last error is raised when the attempts run out.
+    def __init__(self, attempts=6, base_delay=1.0, max_delay=60.0, stopped=lambda: False,
+                 on_retry=lambda error, delay: None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stopped = stopped
+        self.on_retry = on_retry
+
+    def delay(self, attempt, error):
+        hinted = retry_after(error)
+        if hinted is not None:
+            return min(hinted, self.max_delay * 10) + random.uniform(0, self.base_delay)
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def wait(self, delay):
+        waited_until = time.monotonic() + delay
+
+        while not self.stopped() and time.monotonic() < waited_until:
+            time.sleep(max(0.0, min(0.5, waited_until - time.monotonic())))
+
+    def call(self, function, *args, **kwargs):
+        attempt = 0
+
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:
+                attempt += 1
+                if attempt >= self.attempts or self.stopped() or not is_transient(error):
+                    raise
+
+                delay = self.delay(attempt - 1, error)
+                self.on_retry(error, delay)
+                self.wait(delay)
+
+                if self.stopped():
+                    raise
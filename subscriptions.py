@@ -0,0 +1,79 @@
+from rate_limit import TokenBucket
+from retry import RetryPolicy
+
+SUBSCRIBE_BATCH_SIZE = 100  # Subreddits subscribed to per api/subscribe request
+
+
+def subscribed_names(reddit, retry):
+    # Every subreddit the account subscribes to. PRAW pages through the listing 100 at a time.
+    return retry.call(lambda: [subreddit.display_name for subreddit in reddit.user.subreddits(limit=None)])
+
+
+def missing_subscriptions(source, target):
+    # Subreddits in source that target isn't subscribed to yet, in source order without repeats
+    subscribed = {name.lower() for name in target}
+    missing = []
+
+    for name in source:
+        if name.lower() not in subscribed:
+            subscribed.add(name.lower())
+            missing.append(name)
+
+    return missing
+
+
+class SubscriptionMigrator:
+    # Subscribes an account to a list of subreddits through api/subscribe, which takes a comma separated list, so a
+    # few hundred subscriptions cost a handful of requests instead of one each. Every request takes a token from the
+    # rate-limit budget and is retried if it fails for a transient reason. A batch that is rejected anyway (a banned or
+    # private subreddit in it, say) is subscribed to one subreddit at a time, so one bad name doesn't cost the rest.
+    def __init__(self, reddit, stopped=lambda: False, budget=None, retry=None):
+        self.reddit = reddit
+        self.stopped = stopped
+        self.budget = budget if budget is not None else TokenBucket()
+        self.retry = retry if retry is not None else RetryPolicy(stopped=stopped)
+
+    def subscribe_batch(self, batch):
+        if not self.budget.acquire(self.stopped):
+            return False
+
+        self.reddit.post("api/subscribe", data={"action": "sub", "sr_name": ",".join(batch)})
+        self.budget.update_from_reddit(self.reddit)
+
+        return True
+
+    def subscribe(self, names):
+        # Yields (name, error) for each subreddit as it's done, error being None when it was subscribed to
+        for start in range(0, len(names), SUBSCRIBE_BATCH_SIZE):
+            batch = names[start:start + SUBSCRIBE_BATCH_SIZE]
+            if self.stopped():
+                return
+
+            try:
+                subscribed = self.retry.call(self.subscribe_batch, batch)
+            except Exception:
+                if self.stopped():
+                    return
+
+                yield from self.subscribe_each(batch)
+                continue
+
+            if not subscribed:
+                return
+
+            for name in batch:
+                yield name, None
+
+    def subscribe_each(self, batch):
+        for name in batch:
+            try:
+                if not self.retry.call(self.subscribe_batch, [name]):
+                    return
+            except Exception as error:
+                if self.stopped():
+                    return
+
+                yield name, error
+                continue
+
+            yield name, None
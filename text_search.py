@@ -0,0 +1,140 @@
+import concurrent.futures
+import multiprocessing
+import re
+import numpy
+
+SEARCH_MODES = ["Text", "Regex", "Fuzzy"]
+SCAN_CHUNK_SIZE = 5000  # Texts sent to a worker process at a time
+PARALLEL_THRESHOLD = 20000  # Fewer texts than this are scanned in the calling thread
+
+
+def max_errors(pattern):
+    # Typos a fuzzy search allows: one per three characters of the pattern, up to three
+    return min(3, len(pattern) // 3)
+
+
+def fuzzy_pieces(pattern, errors):
+    # A match with at most n typos has to contain at least one of n + 1 pieces of the pattern exactly. Returns each
+    # piece with where it starts in the pattern.
+    size = len(pattern) // (errors + 1)
+
+    return [(pattern[index * size:(index + 1) * size if index < errors else len(pattern)], index * size)
+            for index in range(errors + 1)]
+
+
+def fuzzy_contains(pattern, text, errors, pieces):
+    # Only the stretches of text around an exact piece are searched, so texts without any piece cost a few substring
+    # checks and the rest are never scanned end to end
+    for piece, offset in pieces:
+        position = text.find(piece)
+
+        while position != -1:
+            start = max(0, position - offset - errors)
+            if fuzzy_search(pattern, text[start:position - offset + len(pattern) + errors], errors):
+                return True
+
+            position = text.find(piece, position + 1)
+
+    return False
+
+
+def fuzzy_search(pattern, text, errors):
+    # Whether pattern appears in text with at most errors insertions, deletions or substitutions (bit-parallel
+    # Wu-Manber). Bit i of states[d] is set when the first i + 1 characters of the pattern match the text so far with d
+    # errors.
+    masks = {}
+    for index, character in enumerate(pattern):
+        masks[character] = masks.get(character, 0) | 1 << index
+
+    found = 1 << len(pattern) - 1
+    width = (1 << len(pattern)) - 1
+    states = [(1 << errors) - 1 for errors in range(errors + 1)]
+    if states[-1] & found:
+        return True
+
+    for character in text:
+        mask = masks.get(character, 0)
+        previous = states[0]
+        states[0] = (previous << 1 | 1) & mask
+
+        for errors in range(1, len(states)):
+            current = states[errors]
+            states[errors] = ((current << 1 | 1) & mask | previous | (previous | states[errors - 1]) << 1 | 1) & width
+            previous = current
+
+        if states[-1] & found:
+            return True
+
+    return False
+
+
+def scan(mode, pattern, texts):
+    # Positions of the texts that match. This runs in the worker processes, so it only takes picklable arguments.
+    if mode == "Regex":
+        expression = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        return [index for index, text in enumerate(texts) if expression.search(text)]
+
+    pattern = pattern.lower()
+    errors = max_errors(pattern)
+    pieces = fuzzy_pieces(pattern, errors)
+    matches = []
+
+    for index, text in enumerate(texts):
+        if fuzzy_contains(pattern, text.lower(), errors, pieces):
+            matches.append(index)
+
+    return matches
+
+
+def text_matcher(search_text, filters):
+    # The matcher for a regex or fuzzy search, or None when the search text is a full-text query for the archive
+    if not search_text or filters["Search Mode"] == "Text":
+        return
+
+    return TextMatcher(filters["Search Mode"], search_text)
+
+
+class TextMatcher:
+    # Regex or fuzzy search over the text of gathered content, for the patterns the full-text index can't answer
+    # (phone numbers, e-mail addresses, typos...). Large scans are split into chunks across a process pool, one per
+    # core, and the matches are handed back a chunk at a time as the workers finish them.
+    def __init__(self, mode, pattern):
+        self.mode = mode
+        self.pattern = pattern
+
+        if mode == "Regex":
+            re.compile(pattern)  # Raises re.error for an invalid pattern before any scanning starts
+
+    def texts(self, records, rows):
+        return ["\n".join(records.text[field][row] or "" for field in records.text_fields) for row in rows]
+
+    def matches(self, records, rows, stopped=lambda: False):
+        # Yields the matching rows of each scanned chunk, in the order the chunks finish
+        rows = numpy.asarray(rows, dtype=numpy.int64)
+        chunks = [rows[start:start + SCAN_CHUNK_SIZE] for start in range(0, len(rows), SCAN_CHUNK_SIZE)]
+
+        if len(rows) < PARALLEL_THRESHOLD:
+            for chunk in chunks:
+                if stopped():
+                    return
+
+                yield chunk[scan(self.mode, self.pattern, self.texts(records, chunk.tolist()))]
+            return
+
+        # Spawned rather than forked workers, since the GUI process has threads of its own running
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(mp_context=context) as executor:
+            futures = {executor.submit(scan, self.mode, self.pattern, self.texts(records, chunk.tolist())): chunk
+                       for chunk in chunks}
+
+            for future in concurrent.futures.as_completed(futures):
+                if stopped():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+
+                yield futures[future][future.result()]
+
+    def matching_rows(self, records, rows, stopped=lambda: False):
+        matches = list(self.matches(records, rows, stopped))
+
+        return numpy.concatenate(matches) if matches else numpy.zeros(0, dtype=numpy.int64)